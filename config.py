@@ -2,9 +2,11 @@
 Configuration management for Travel Planner
 """
 import os
+from functools import lru_cache
 from typing import Dict
 
 
+@lru_cache(maxsize=1)
 def load_api_keys() -> Dict[str, str]:
     """
     Load API keys from environment variables or config file
@@ -41,6 +43,7 @@ def load_api_keys() -> Dict[str, str]:
     return keys
 
 
+@lru_cache(maxsize=1)
 def get_app_config() -> Dict:
     """
     Get application configuration settings
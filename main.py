@@ -9,7 +9,6 @@ from ui.cli import TravelPlannerCLI
 from services.flight_service import FlightService
 from services.hotel_service import HotelService
 from services.activity_service import ActivityService
-from langchain_openai import OpenAI
 from ui.cli import TravelPlannerUI
 
 
@@ -23,8 +22,9 @@ def main():
     
     # Load API keys
     keys = load_api_keys()
-    
-    # Initialize LLM
+
+    # Initialize LLM (imported lazily - langchain is expensive to import)
+    from langchain_openai import OpenAI
     llm = OpenAI(openai_api_key=keys['openai_api_key'], temperature=0.7)
     
     # Initialize services
@@ -1,16 +1,82 @@
 """
 Travel plan model
 """
-from datetime import datetime
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import date
 from typing import Dict, List, Optional, Any
 import json
 
+# orjson is much faster at JSON encode/decode; fall back to stdlib json if missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Public fields included in serialization, in display order
+PLAN_FIELDS = ('total_budget', 'remaining_budget', 'departure', 'destination',
+               'departure_date', 'return_date', 'travelers', 'flights',
+               'hotels', 'activities')
+
+
+@dataclass(slots=True)
+class FlightBooking:
+    """Booked flight record.
+
+    Same slots/dict-shim shape as HotelBooking: compact storage and
+    attribute reads, with subscription kept for dict-style consumers.
+    """
+    option: int
+    price: float
+    details: str = ''
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __setitem__(self, key, value) -> None:
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+
+@dataclass(slots=True)
+class HotelBooking:
+    """Booked hotel record.
+
+    Slots-based dataclass: a fraction of the memory of the dict it
+    replaces, with direct attribute reads instead of key hashing.
+    Subscription and get() are kept so dict-style consumers still work.
+    """
+    option: int
+    price: float
+    nights: int
+    destination: str = ''
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __setitem__(self, key, value) -> None:
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
 
 class TravelPlan:
     """Travel plan class with validation and helper methods"""
+
+    # Fixed attribute layout: smaller instances and faster attribute access
+    # than a per-instance __dict__ (flights/hotels live in _flights/_hotels
+    # behind their properties)
+    __slots__ = ('total_budget', 'remaining_budget', 'departure', 'destination',
+                 '_departure_date', '_return_date', '_departure_date_obj',
+                 '_return_date_obj', 'travelers', '_flights', '_hotels',
+                 'activities', '_cost_cache', '_duration_cache')
+
     def __init__(self):
-        self.total_budget: Optional[float] = None
-        self.remaining_budget: Optional[float] = None
+        self._cost_cache: Optional[tuple] = None
+        self.total_budget: float = 0.0
+        self.remaining_budget: float = 0.0
         self.departure: Dict[str, Optional[str]] = {'name': None, 'iata': None}
         self.destination: Dict[str, Optional[str]] = {'name': None, 'iata': None}
         self.departure_date: Optional[str] = None
@@ -19,86 +85,181 @@ class TravelPlan:
         self.flights: Optional[Dict[str, Any]] = None
         self.hotels: Optional[Dict[str, Any]] = None
         self.activities: List[Dict[str, Any]] = []  # List to allow multiple activities
-        
+
+    @property
+    def departure_date(self) -> Optional[str]:
+        return self._departure_date
+
+    @departure_date.setter
+    def departure_date(self, value: Optional[str]) -> None:
+        self._departure_date = value
+        self._departure_date_obj = self._parse_date(value)
+        self._duration_cache = None
+
+    @property
+    def return_date(self) -> Optional[str]:
+        return self._return_date
+
+    @return_date.setter
+    def return_date(self, value: Optional[str]) -> None:
+        self._return_date = value
+        self._return_date_obj = self._parse_date(value)
+        self._duration_cache = None
+
+    @property
+    def departure_date_obj(self) -> Optional[date]:
+        """Departure date as a date object, parsed once in the setter"""
+        return self._departure_date_obj
+
+    @property
+    def return_date_obj(self) -> Optional[date]:
+        """Return date as a date object, parsed once in the setter"""
+        return self._return_date_obj
+
+    @staticmethod
+    def _parse_date(value: Optional[str]) -> Optional[date]:
+        """Parse a YYYY-MM-DD string to a date, or None if invalid"""
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+
+    @property
+    def flights(self) -> Optional[Dict[str, Any]]:
+        return self._flights
+
+    @flights.setter
+    def flights(self, value: Optional[Dict[str, Any]]) -> None:
+        self._flights = value
+        self._cost_cache = None
+
+    @property
+    def hotels(self) -> Optional[Dict[str, Any]]:
+        return self._hotels
+
+    @hotels.setter
+    def hotels(self, value: Optional[Dict[str, Any]]) -> None:
+        self._hotels = value
+        self._cost_cache = None
+
+    @property
+    def cost_breakdown(self) -> Dict[str, float]:
+        """Per-category booking costs, cached until bookings change"""
+        # Bookings can be mutated in place (appended activities, edited
+        # hotel price/nights), so key the cache on the prices themselves
+        # rather than a count that same-size edits leave unchanged
+        signature = (
+            self.flights.get('price', 0) if self.flights else 0,
+            self.hotels.get('price', 0) if self.hotels else 0,
+            tuple(a.get('price', 0) for a in (self.activities or ())),
+        )
+        if self._cost_cache is None or self._cost_cache[0] != signature:
+            breakdown = {
+                'flights': signature[0],
+                'hotels': signature[1],
+                'activities': sum(signature[2]),
+            }
+            self._cost_cache = (signature, breakdown)
+        return self._cost_cache[1]
+
+    @property
+    def total_spent(self) -> float:
+        """Total cost of all bookings"""
+        return sum(self.cost_breakdown.values())
+
     def calculate_remaining_budget(self) -> float:
         """Calculate remaining budget based on all bookings"""
-        spent = 0
-        if self.flights and 'price' in self.flights:
-            spent += self.flights['price']
-        if self.hotels and 'price' in self.hotels:
-            spent += self.hotels['price']
-        for activity in self.activities:
-            if 'price' in activity:
-                spent += activity['price']
-        
+        # Bind locally to avoid repeated self.* attribute loads
+        flights, hotels = self.flights, self.hotels
+        spent = ((flights.get('price', 0) if flights else 0)
+                 + (hotels.get('price', 0) if hotels else 0)
+                 + sum(a.get('price', 0) for a in self.activities))
+
         self.remaining_budget = self.total_budget - spent
         return self.remaining_budget
     
+    @property
+    def trip_duration_days(self) -> int:
+        """Trip duration in days, cached until either date changes"""
+        if self._duration_cache is None:
+            if not self._departure_date_obj or not self._return_date_obj:
+                self._duration_cache = 0
+            else:
+                self._duration_cache = (self._return_date_obj - self._departure_date_obj).days
+        return self._duration_cache
+
     def get_trip_duration_days(self) -> int:
         """Calculate trip duration in days"""
-        if not self.departure_date or not self.return_date:
-            return 0
-        try:
-            delta = datetime.strptime(self.return_date, "%Y-%m-%d") - datetime.strptime(self.departure_date, "%Y-%m-%d")
-            return delta.days
-        except ValueError:
-            return 0
+        return self.trip_duration_days
             
     def to_dict(self) -> Dict:
         """Convert travel plan to dictionary for serialization"""
-        return {
-            'total_budget': self.total_budget,
-            'remaining_budget': self.remaining_budget,
-            'departure': self.departure,
-            'destination': self.destination,
-            'departure_date': self.departure_date,
-            'return_date': self.return_date,
-            'travelers': self.travelers,
-            'flights': self.flights,
-            'hotels': self.hotels,
-            'activities': self.activities
-        }
-        
+        data = {name: getattr(self, name) for name in PLAN_FIELDS}
+        for key in ('flights', 'hotels'):
+            if is_dataclass(data[key]):
+                data[key] = asdict(data[key])
+        return data
+
     @classmethod
     def from_dict(cls, data: Dict) -> 'TravelPlan':
         """Create travel plan from dictionary"""
         plan = cls()
-        for key, value in data.items():
-            setattr(plan, key, value)
+        for key in PLAN_FIELDS:
+            if key in data:
+                setattr(plan, key, data[key])
+        if isinstance(plan.flights, dict):
+            plan.flights = FlightBooking(**{k: v for k, v in plan.flights.items()
+                                            if k in ('option', 'price', 'details')})
+        if isinstance(plan.hotels, dict):
+            plan.hotels = HotelBooking(**{k: v for k, v in plan.hotels.items()
+                                          if k in ('option', 'price', 'nights', 'destination')})
         return plan
     
     def save_to_file(self, filename: str) -> None:
         """Save travel plan to JSON file"""
-        with open(filename, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
-            
+        if orjson is not None:
+            with open(filename, 'wb', buffering=65536) as f:
+                f.write(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w', buffering=65536) as f:
+                json.dump(self.to_dict(), f, indent=2)
+
     @classmethod
     def load_from_file(cls, filename: str) -> Optional['TravelPlan']:
         """Load travel plan from JSON file"""
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-                return cls.from_dict(data)
-        except (FileNotFoundError, json.JSONDecodeError):
+            if orjson is not None:
+                with open(filename, 'rb', buffering=65536) as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(filename, 'r', buffering=65536) as f:
+                    data = json.loads(f.read())
+            return cls.from_dict(data)
+        except (FileNotFoundError, ValueError):
             return None
             
     def get_summary(self) -> str:
         """Generate a summary of the travel plan"""
-        summary = f"TRAVEL PLAN SUMMARY\n{'='*50}\n"
-        summary += f"Trip: {self.departure['name']} → {self.destination['name']}\n"
-        summary += f"Dates: {self.departure_date} to {self.return_date} ({self.get_trip_duration_days()} days)\n"
-        summary += f"Travelers: {self.travelers}\n"
-        summary += f"Budget: ${self.total_budget:.2f} (${self.remaining_budget:.2f} remaining)\n\n"
-        
+        # Collect parts and join once instead of repeated string concatenation
+        parts = [
+            f"TRAVEL PLAN SUMMARY\n{'='*50}",
+            f"Trip: {self.departure['name']} → {self.destination['name']}",
+            f"Dates: {self.departure_date} to {self.return_date} ({self.get_trip_duration_days()} days)",
+            f"Travelers: {self.travelers}",
+            f"Budget: ${self.total_budget:.2f} (${self.remaining_budget:.2f} remaining)\n",
+        ]
+
         if self.flights:
-            summary += f"FLIGHT: Option {self.flights['option']} - ${self.flights['price']:.2f}\n"
-            
+            parts.append(f"FLIGHT: Option {self.flights['option']} - ${self.flights['price']:.2f}")
+
         if self.hotels:
-            summary += f"HOTEL: Option {self.hotels['option']} - ${self.hotels['price']:.2f}\n"
-            
+            parts.append(f"HOTEL: Option {self.hotels['option']} - ${self.hotels['price']:.2f}")
+
         if self.activities:
-            summary += "ACTIVITIES:\n"
-            for activity in self.activities:
-                summary += f"- Option {activity['option']} - ${activity['price']:.2f}\n"
-                
-        return summary
\ No newline at end of file
+            parts.append("ACTIVITIES:")
+            parts.extend(f"- Option {activity['option']} - ${activity['price']:.2f}"
+                         for activity in self.activities)
+
+        return "\n".join(parts) + "\n"
\ No newline at end of file
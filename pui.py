@@ -1,18 +1,18 @@
 import streamlit as st
-from datetime import datetime
-from models.travel_plan import TravelPlan
+from models.travel_plan import FlightBooking, HotelBooking, TravelPlan
 from services.api_wrappers import search_flights, format_flight_data, get_hotel_suggestions, get_activity_suggestions
 from utils.location_utils import find_iata_code
 from utils.date_utils import validate_date_format
 
-# Initialize session state
-if 'travel_plan' not in st.session_state:
-    st.session_state.travel_plan = TravelPlan()
-    st.session_state.messages = [
-        {"role": "assistant", "content": "👋 Welcome to the Travel Planning Assistant! Where would you like to go on your next trip?"}
-    ]
-    st.session_state.current_step = "destination"
-    st.session_state.pending_action = None
+def init_session_state():
+    """Initialize session state on first run"""
+    if 'travel_plan' not in st.session_state:
+        st.session_state.travel_plan = TravelPlan()
+        st.session_state.messages = [
+            {"role": "assistant", "content": "👋 Welcome to the Travel Planning Assistant! Where would you like to go on your next trip?"}
+        ]
+        st.session_state.current_step = "destination"
+        st.session_state.pending_action = None
 
 class IntegratedTravelAgent:
     def __init__(self):
@@ -27,12 +27,10 @@ class IntegratedTravelAgent:
                     st.markdown(message["content"])
                     
                     # Show budget if available
-                    if (message["role"] == "assistant" and 
-                        hasattr(st.session_state.travel_plan, 'total_budget') and 
-                        hasattr(st.session_state.travel_plan, 'remaining_budget')):
-                        remaining = st.session_state.travel_plan.remaining_budget or 0  # Handle None
-                        total = st.session_state.travel_plan.total_budget or 0  # Handle None
-                        
+                    if message["role"] == "assistant":
+                        remaining = st.session_state.travel_plan.remaining_budget
+                        total = st.session_state.travel_plan.total_budget
+
                         # Only show progress bar if both values are valid
                         if total > 0:
                             st.progress(remaining/total)
@@ -48,29 +46,24 @@ class IntegratedTravelAgent:
             
             if travel_plan:
                 st.subheader("Trip")
-                if hasattr(travel_plan, 'departure'):
-                    st.write(f"🛫 From: {travel_plan.departure.get('name', 'Not set')}")
-                
-                if hasattr(travel_plan, 'destination'):
-                    st.write(f"🛬 To: {travel_plan.destination.get('name', 'Not set')}")
-            
-            if travel_plan and hasattr(travel_plan, 'departure_date'):
+                st.write(f"🛫 From: {travel_plan.departure.get('name') or 'Not set'}")
+                st.write(f"🛬 To: {travel_plan.destination.get('name') or 'Not set'}")
+
                 st.subheader("Dates")
                 st.write(f"📅 {travel_plan.departure_date} to {travel_plan.return_date}")
-            
-            if travel_plan and hasattr(travel_plan, 'total_budget'):
-                # Get values with proper defaults
-                remaining = getattr(travel_plan, 'remaining_budget', 0) or 0  # Handle None values
-                total = getattr(travel_plan, 'total_budget', 0) or 0  # Handle None values
-                
+
+                remaining = travel_plan.remaining_budget
+                total = travel_plan.total_budget
+
                 st.subheader("Budget")
                 st.metric("Remaining", f"${remaining:.2f}", f"${remaining-total:.2f}")
                 
-                # Breakdown with safe attribute access
-                flight_cost = travel_plan.flights.get('price', 0) if hasattr(travel_plan, 'flights') and travel_plan.flights else 0
-                hotel_cost = travel_plan.hotels.get('price', 0) if hasattr(travel_plan, 'hotels') and travel_plan.hotels else 0
-                activity_cost = sum(a.get('price', 0) for a in travel_plan.activities) if hasattr(travel_plan, 'activities') else 0
-                
+                # Breakdown computed (and cached) on the travel plan
+                costs = travel_plan.cost_breakdown
+                flight_cost = costs['flights']
+                hotel_cost = costs['hotels']
+                activity_cost = costs['activities']
+
                 st.write("**Breakdown:**")
                 st.write(f"✈️ Flights: ${flight_cost:.2f}")
                 st.write(f"🏨 Hotels: ${hotel_cost:.2f}")
@@ -85,7 +78,10 @@ class IntegratedTravelAgent:
     def process_input(self, user_input):
         """Process user input using your actual backend logic"""
         self.add_message("user", user_input)
-        
+
+        # Normalize once; the step handlers compare against lowercase commands
+        norm = user_input.strip().lower()
+
         try:
             if st.session_state.current_step == "destination":
                 self._process_destination(user_input)
@@ -98,13 +94,13 @@ class IntegratedTravelAgent:
             elif st.session_state.current_step == "budget":
                 self._process_budget(user_input)
             elif st.session_state.current_step == "flights":
-                self._process_flights(user_input)
+                self._process_flights(norm)
             elif st.session_state.current_step == "hotels":
-                self._process_hotels(user_input)
+                self._process_hotels(norm)
             elif st.session_state.current_step == "activities":
-                self._process_activities(user_input)
+                self._process_activities(norm)
             elif st.session_state.current_step == "summary":
-                self._process_summary(user_input)
+                self._process_summary(norm)
             
             # Force immediate rerun to process the next step if needed
             st.rerun()
@@ -174,9 +170,9 @@ class IntegratedTravelAgent:
         except ValueError:
             self.add_message("assistant", "Please enter a valid number")
 
-    def _process_flights(self, user_input):
+    def _process_flights(self, norm):
         """Process flights using your actual flight service"""
-        if user_input.lower() == 'yes':
+        if norm == 'yes':
             with st.spinner("Searching flights..."):
                 flights = search_flights(
                     st.session_state.travel_plan.departure['iata'],
@@ -187,54 +183,49 @@ class IntegratedTravelAgent:
                     st.session_state.travel_plan.remaining_budget
                 )
                 formatted = format_flight_data(flights, st.session_state.travel_plan)
+                # Cache results so booking doesn't repeat the API round trip
+                st.session_state.flight_results = flights
                 self.add_message("assistant", formatted)
                 self.add_message("assistant", "Please select an option (1-3) or type 'skip'")
                 st.session_state.pending_action = "book_flight"
-        elif user_input.lower() == 'no':
+        elif norm == 'no':
             self.add_message("assistant", "Would you like to search for hotels instead?")
             st.session_state.current_step = "hotels"
         elif st.session_state.pending_action == "book_flight":
-            self._book_flight(user_input)
+            self._book_flight(norm)
 
-    def _book_flight(self, user_input):
+    def _book_flight(self, norm):
         """Book flight using your actual flight data"""
-        if user_input.isdigit() and int(user_input) in [1, 2, 3]:
-            option = int(user_input) - 1
-            flights = search_flights(
-                st.session_state.travel_plan.departure['iata'],
-                st.session_state.travel_plan.destination['iata'],
-                st.session_state.travel_plan.departure_date,
-                st.session_state.travel_plan.return_date,
-                st.session_state.travel_plan.travelers,
-                st.session_state.travel_plan.remaining_budget
-            )
+        if norm.isdigit() and int(norm) in [1, 2, 3]:
+            option = int(norm) - 1
+            # Reuse the results already fetched in _process_flights
+            flights = st.session_state.flight_results
             price = float(flights['data'][option]['price']['total'])
             
             if price <= st.session_state.travel_plan.remaining_budget:
-                st.session_state.travel_plan.flights = {
-                    'option': int(user_input),
-                    'price': price,
-                    'details': format_flight_data(flights, st.session_state.travel_plan)
-                }
+                st.session_state.travel_plan.flights = FlightBooking(
+                    option=int(norm),
+                    price=price,
+                    details=format_flight_data(flights, st.session_state.travel_plan)
+                )
                 st.session_state.travel_plan.remaining_budget -= price
                 self.add_message("assistant", f"Flight booked! Remaining budget: ${st.session_state.travel_plan.remaining_budget:.2f}. Search for hotels? (yes/no)")
                 st.session_state.current_step = "hotels"
                 st.session_state.pending_action = None
             else:
                 self.add_message("assistant", f"That exceeds your budget by ${price - st.session_state.travel_plan.remaining_budget:.2f}. Please choose another option.")
-        elif user_input.lower() == 'skip':
+        elif norm == 'skip':
             self.add_message("assistant", "Skipping flights. Search for hotels? (yes/no)")
             st.session_state.current_step = "hotels"
             st.session_state.pending_action = None
         else:
             self.add_message("assistant", "Please select 1-3 or type 'skip'")
 
-    def _process_hotels(self, user_input):
+    def _process_hotels(self, norm):
         """Process hotels using your actual hotel service"""
-        if user_input.lower() == 'yes':
+        if norm == 'yes':
             with st.spinner("Searching hotels..."):
-                nights = (datetime.strptime(st.session_state.travel_plan.return_date, "%Y-%m-%d") - 
-                         datetime.strptime(st.session_state.travel_plan.departure_date, "%Y-%m-%d")).days
+                nights = st.session_state.travel_plan.get_trip_duration_days()
                 hotels = get_hotel_suggestions(
                     st.session_state.travel_plan.destination['name'],
                     st.session_state.travel_plan.remaining_budget,
@@ -244,45 +235,43 @@ class IntegratedTravelAgent:
                 self.add_message("assistant", hotels)
                 self.add_message("assistant", "Please select an option (1-3) or type 'skip'")
                 st.session_state.pending_action = "book_hotel"
-        elif user_input.lower() == 'no':
+        elif norm == 'no':
             self.add_message("assistant", "Would you like to search for activities instead?")
             st.session_state.current_step = "activities"
         elif st.session_state.pending_action == "book_hotel":
-            self._book_hotel(user_input)
+            self._book_hotel(norm)
 
-    def _book_hotel(self, user_input):
+    def _book_hotel(self, norm):
         """Book hotel using your actual hotel data"""
-        if user_input.isdigit() and int(user_input) in [1, 2, 3]:
+        if norm.isdigit() and int(norm) in [1, 2, 3]:
             # This is a simplified booking - you would use your actual hotel booking logic
-            nights = (datetime.strptime(st.session_state.travel_plan.return_date, "%Y-%m-%d") - 
-                     datetime.strptime(st.session_state.travel_plan.departure_date, "%Y-%m-%d")).days
-            price = 100 * int(user_input) * nights  # Simplified pricing
+            nights = st.session_state.travel_plan.get_trip_duration_days()
+            price = 100 * int(norm) * nights  # Simplified pricing
             
             if price <= st.session_state.travel_plan.remaining_budget:
-                st.session_state.travel_plan.hotels = {
-                    'option': int(user_input),
-                    'price': price,
-                    'nights': nights
-                }
+                st.session_state.travel_plan.hotels = HotelBooking(
+                    option=int(norm),
+                    price=price,
+                    nights=nights
+                )
                 st.session_state.travel_plan.remaining_budget -= price
                 self.add_message("assistant", f"Hotel booked! Remaining budget: ${st.session_state.travel_plan.remaining_budget:.2f}. Search for activities? (yes/no)")
                 st.session_state.current_step = "activities"
                 st.session_state.pending_action = None
             else:
                 self.add_message("assistant", f"That exceeds your budget by ${price - st.session_state.travel_plan.remaining_budget:.2f}. Please choose another option.")
-        elif user_input.lower() == 'skip':
+        elif norm == 'skip':
             self.add_message("assistant", "Skipping hotels. Search for activities? (yes/no)")
             st.session_state.current_step = "activities"
             st.session_state.pending_action = None
         else:
             self.add_message("assistant", "Please select 1-3 or type 'skip'")
 
-    def _process_activities(self, user_input):
+    def _process_activities(self, norm):
         """Process activities using your actual activity service"""
-        if user_input.lower() == 'yes':
+        if norm == 'yes':
             with st.spinner("Searching activities..."):
-                days = (datetime.strptime(st.session_state.travel_plan.return_date, "%Y-%m-%d") - 
-                       datetime.strptime(st.session_state.travel_plan.departure_date, "%Y-%m-%d")).days
+                days = st.session_state.travel_plan.get_trip_duration_days()
                 activities = get_activity_suggestions(
                     st.session_state.travel_plan.destination['name'],
                     st.session_state.travel_plan.remaining_budget,
@@ -291,29 +280,22 @@ class IntegratedTravelAgent:
                 self.add_message("assistant", activities)
                 self.add_message("assistant", "Select activities to add (comma-separated numbers) or type 'done'")
                 st.session_state.pending_action = "add_activities"
-        elif user_input.lower() == 'no':
+        elif norm == 'no':
             self.add_message("assistant", "Type 'summary' to see your complete itinerary")
             st.session_state.current_step = "summary"
         elif st.session_state.pending_action == "add_activities":
-            self._add_activities(user_input)
+            self._add_activities(norm)
 
-    def _add_activities(self, user_input):
+    def _add_activities(self, norm):
         """Add activities using your actual activity data"""
-        if user_input.lower() == 'done':
+        if norm == 'done':
             self.add_message("assistant", "Type 'summary' to see your complete itinerary")
             st.session_state.current_step = "summary"
             st.session_state.pending_action = None
         else:
             try:
-                selected = [int(num.strip()) for num in user_input.split(",")]
-                days = (datetime.strptime(st.session_state.travel_plan.return_date, "%Y-%m-%d") - 
-                       datetime.strptime(st.session_state.travel_plan.departure_date, "%Y-%m-%d")).days
-                activities = get_activity_suggestions(
-                    st.session_state.travel_plan.destination['name'],
-                    st.session_state.travel_plan.remaining_budget,
-                    days
-                )
-                
+                selected = [int(num.strip()) for num in norm.split(",")]
+
                 # Simplified activity addition - adapt with your actual logic
                 total_cost = 0
                 for num in selected:
@@ -338,16 +320,17 @@ class IntegratedTravelAgent:
             except ValueError:
                 self.add_message("assistant", "Please enter numbers separated by commas (e.g., '1,3') or type 'done'")
 
-    def _process_summary(self, user_input):
+    def _process_summary(self, norm):
         """Generate summary using your actual travel plan data"""
-        if "summary" in user_input.lower():
-            flight_cost = st.session_state.travel_plan.flights.get('price', 0) if hasattr(st.session_state.travel_plan, 'flights') else 0
-            hotel_cost = st.session_state.travel_plan.hotels.get('price', 0) if hasattr(st.session_state.travel_plan, 'hotels') else 0
-            activity_cost = sum(a.get('price', 0) for a in st.session_state.travel_plan.activities) if hasattr(st.session_state.travel_plan, 'activities') else 0
+        if "summary" in norm:
+            costs = st.session_state.travel_plan.cost_breakdown
+            flight_cost = costs['flights']
+            hotel_cost = costs['hotels']
+            activity_cost = costs['activities']
             
             summary = f"""
             **Trip Summary**
-            From: {st.session_state.travel_plan.departure['name'] if hasattr(st.session_state.travel_plan, 'departure') else 'Not set'} 
+            From: {st.session_state.travel_plan.departure['name'] or 'Not set'}
             To: {st.session_state.travel_plan.destination['name']}
             Dates: {st.session_state.travel_plan.departure_date} to {st.session_state.travel_plan.return_date}
             Travelers: {st.session_state.travel_plan.travelers}
@@ -360,7 +343,7 @@ class IntegratedTravelAgent:
             **Bookings**
             Flights: {'Not booked' if flight_cost == 0 else f"Option {st.session_state.travel_plan.flights['option']} (${flight_cost:.2f})"}
             Hotels: {'Not booked' if hotel_cost == 0 else f"Option {st.session_state.travel_plan.hotels['option']} (${hotel_cost:.2f})"}
-            Activities: {len(st.session_state.travel_plan.activities) if hasattr(st.session_state.travel_plan, 'activities') else 0} (${activity_cost:.2f})
+            Activities: {len(st.session_state.travel_plan.activities)} (${activity_cost:.2f})
             """
             
             self.add_message("assistant", summary)
@@ -368,6 +351,7 @@ class IntegratedTravelAgent:
 
     def run(self):
         """Run the application"""
+        init_session_state()
         col1, col2 = st.columns([3, 1])
         
         with col1:
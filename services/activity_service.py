@@ -1,75 +1,148 @@
 """
 Activity service for managing activity-related operations
 """
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
 from datetime import datetime
 from models.travel_plan import TravelPlan
-from langchain_core.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain.memory import ConversationBufferMemory
+from services.llm_cache import CachingLLM, bucket_budget
 from utils.input_utils import get_numeric_input
 
+# Compiled once for the free-text fallback parser: a single match per line
+# replaces a ladder of startswith checks and repeated lowercase substring scans
+_OPTION_RE = re.compile(r"^(?:(?P<opt>[1-5])\.|Activity\s+(?P<opt2>[1-5]):)")
+_FIELD_RE = re.compile(
+    r"(?P<price>cost|price|\$)|(?P<duration>duration|time|hour)"
+    r"|(?P<value>worth|why)|(?P<category>category|type)", re.I)
+
+# Display separator, built once instead of per print
+_SEP60 = '=' * 60
+
+# Cap on generated tokens for suggestion prompts: output tokens dominate
+# both the latency and the cost of these calls
+_MAX_SUGGESTION_TOKENS = 400
+
+# Activity suggestion prompt shown at the start of the booking dialogue
+_SUGGESTION_TEMPLATE = """As a travel assistant, suggest 3-5 activities for the destination below,
+staying within the traveler's total budget. For each activity include:
+- Activity name
+- Approximate cost per person
+- Time required (half-day/full-day)
+- Why it's worth doing
+- Category (cultural, adventure, relaxation, etc.)
+
+Format as a numbered list with clear sections.
+Keep the response under 400 tokens: short phrases, no prose introduction.
+
+Destination: {destination}
+Total budget: ${budget:.2f}"""
+
+# Static metadata for the numbered booking options:
+# (name, category, duration, budget fraction, price cap)
+_ACTIVITY_TEMPLATES = (
+    ("City Tour", "Cultural", "Half-day", 0.15, 50),
+    ("Museum Visit", "Cultural", "Half-day", 0.10, 30),
+    ("Outdoor Adventure", "Adventure", "Full-day", 0.25, 80),
+    ("Local Cuisine Experience", "Culinary", "Half-day", 0.15, 60),
+    ("Evening Entertainment", "Entertainment", "Evening", 0.15, 45),
+)
+
 class ActivityService:
     """Service for activity search and booking"""
-    
+
     def __init__(self, llm: Any):
         self.llm = llm
-        
+        # Cached wrapper: repeat prompts are answered from the cache
+        self.cached_llm = CachingLLM(llm)
+        # Background prefetch of suggestions, keyed by destination name
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._prefetched = None
+
+    def prefetch(self, travel_plan: TravelPlan) -> None:
+        """Start fetching activity suggestions in the background.
+
+        Called while the user is still in an earlier menu (e.g. confirming
+        hotels), so the suggestions are usually ready by the time they reach
+        the activities dialogue.
+        """
+        destination = travel_plan.destination['name']
+        if not destination:
+            return
+        if self._prefetched is not None and self._prefetched[0] == destination:
+            return
+        prompt_str = _SUGGESTION_TEMPLATE.format(
+            destination=destination,
+            budget=travel_plan.remaining_budget
+        )
+        self._prefetched = (destination,
+                            self._executor.submit(self.cached_llm.invoke, prompt_str,
+                                                  max_tokens=_MAX_SUGGESTION_TOKENS))
+
+    def _take_prefetched(self, destination: str):
+        """Return the prefetched response for this destination, or None"""
+        if self._prefetched is None or self._prefetched[0] != destination:
+            return None
+        future = self._prefetched[1]
+        self._prefetched = None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
     def discuss_activities(self, travel_plan: TravelPlan) -> None:
         """AI-generated activity suggestions based on remaining budget and destination"""
         if not travel_plan.hotels:
             print("\n🏨 Please book hotels first!")
             return
             
-        # Calculate remaining days
-        nights = travel_plan.get_trip_duration_days()
+        # Calculate remaining days (cached on the plan until a date changes)
+        nights = travel_plan.trip_duration_days
         daily_budget = travel_plan.remaining_budget / nights if nights > 0 else travel_plan.remaining_budget
         
-        # AI Prompt Template
-        prompt = PromptTemplate(
-            input_variables=["destination", "budget"],
-            template="""As a travel assistant, suggest 3-5 activities in {destination}
-            with a total budget of ${budget:.2f}. For each activity include:
-            - Activity name
-            - Approximate cost per person
-            - Time required (half-day/full-day)
-            - Why it's worth doing
-            - Category (cultural, adventure, relaxation, etc.)
-
-            Format as a numbered list with clear sections."""
+        # Format the prompt directly and call the LLM without LLMChain:
+        # chain assembly adds per-call validation and callback overhead that
+        # a simple template does not need. Static instructions lead, dynamic
+        # values trail so provider-side prompt caching can reuse the prefix.
+        prompt_str = _SUGGESTION_TEMPLATE.format(
+            destination=travel_plan.destination['name'],
+            budget=travel_plan.remaining_budget
         )
-        
-        # Generate suggestions
-        chain = LLMChain(llm=self.llm, prompt=prompt)
-        response = chain.invoke({
-            "destination": travel_plan.destination['name'],
-            "budget": travel_plan.remaining_budget
-        })["text"]
+
+        # Generate suggestions, reusing a background prefetch when one was
+        # started during an earlier menu
+        response = self._take_prefetched(travel_plan.destination['name'])
+        if response is None:
+            response = self.cached_llm.invoke(prompt_str, max_tokens=_MAX_SUGGESTION_TOKENS)
+        response = str(response)
         
         # Display results
-        print(f"\n{'='*60}\n🎡 ACTIVITY SUGGESTIONS IN {travel_plan.destination['name'].upper()}\n{'='*60}")
+        print(f"\n{_SEP60}\n🎡 ACTIVITY SUGGESTIONS IN {travel_plan.destination['name'].upper()}\n{_SEP60}")
         print(f"💰 Remaining Budget: ${travel_plan.remaining_budget:.2f} | 📅 {nights} days\n")
         print(response)
         
-        # Use a direct prompt template approach instead of chains with memory
-        inquiry_template = """You're a helpful activity planning assistant for {destination}.
-        The user has a budget of ${budget:.2f}.
-        
+        # Use a direct prompt template approach instead of chains with memory;
+        # static instructions lead, per-turn context trails for prefix caching
+        inquiry_template = """You're a helpful activity planning assistant.
+        Please provide a detailed and helpful response about the activity options specifically addressing the user's question.
+
+        Destination: {destination}
+        Budget: ${budget:.2f}
+
         Available activity options:
         {activities_info}
+
+        The user's question is: {question}"""
         
-        The user's question is: {question}
-        
-        Please provide a detailed and helpful response about the activity options specifically addressing the user's question."""
-        
-        # Track booked activities
-        if not hasattr(travel_plan, 'activities') or not travel_plan.activities:
-            travel_plan.activities = []
-        
-        # Booking interaction
+        # Booking interaction (TravelPlan always initializes activities=[])
         while True:
             choice = input("\nChoose an option (1-5), [B] to see booked activities, [X] to finish, or ask a question about the options: ").strip().upper()
-            
+            # Parse the numeric path once up front instead of re-running
+            # isdigit()/int() in the branch below
+            option_num = int(choice) if choice.isdigit() else None
+
             if choice == 'X':
                 if not travel_plan.activities:
                     print("No activities booked. Are you sure you want to skip? [Y/N]")
@@ -82,30 +155,15 @@ class ActivityService:
                 self.show_booked_activities(travel_plan)
                 continue
                 
-            if choice.isdigit() and 1 <= int(choice) <= 5:
-                option_num = int(choice)
-                
-                # Use predefined activity information based on the option number
-                activity_details = {
-                    1: {"name": "City Tour", "category": "Cultural", "duration": "Half-day", 
-                        "price": min(travel_plan.remaining_budget * 0.15, 50)},
-                    2: {"name": "Museum Visit", "category": "Cultural", "duration": "Half-day", 
-                        "price": min(travel_plan.remaining_budget * 0.10, 30)},
-                    3: {"name": "Outdoor Adventure", "category": "Adventure", "duration": "Full-day", 
-                        "price": min(travel_plan.remaining_budget * 0.25, 80)},
-                    4: {"name": "Local Cuisine Experience", "category": "Culinary", "duration": "Half-day", 
-                        "price": min(travel_plan.remaining_budget * 0.15, 60)},
-                    5: {"name": "Evening Entertainment", "category": "Entertainment", "duration": "Evening", 
-                        "price": min(travel_plan.remaining_budget * 0.15, 45)}
-                }
-                
-                # Get details for selected option
-                selected_activity = activity_details[option_num]
-                
+            if option_num is not None and 1 <= option_num <= 5:
+                # Use predefined activity information based on the option number;
+                # only the price depends on the current budget
+                name, category, duration, pct, cap = _ACTIVITY_TEMPLATES[option_num - 1]
+                price = min(travel_plan.remaining_budget * pct, cap)
+
                 # Show price and confirm
-                price = selected_activity["price"]
-                print(f"\nActivity Option {choice} - {selected_activity['name']}")
-                print(f"Category: {selected_activity['category']} | Duration: {selected_activity['duration']}")
+                print(f"\nActivity Option {choice} - {name}")
+                print(f"Category: {category} | Duration: {duration}")
                 print(f"Estimated price: ${price:.2f}")
                 
                 confirm = input("Confirm booking? (y/n): ").lower()
@@ -115,9 +173,9 @@ class ActivityService:
                         # Add to booked activities
                         travel_plan.activities.append({
                             'option': option_num,
-                            'name': selected_activity['name'],
-                            'category': selected_activity['category'],
-                            'duration': selected_activity['duration'],
+                            'name': name,
+                            'category': category,
+                            'duration': duration,
                             'price': price
                         })
                         
@@ -146,16 +204,16 @@ class ActivityService:
                     question=choice
                 )
                 # Call the LLM directly with correct output handling
-                response = str(self.llm.invoke(filled_prompt))
+                response = str(self.cached_llm.invoke(filled_prompt))
                 print(f"\nAssistant: {response}")
     
     def show_booked_activities(self, travel_plan: TravelPlan) -> None:
         """Display all booked activities"""
-        if not travel_plan.activities or len(travel_plan.activities) == 0:
+        if not travel_plan.activities:
             print("No activities booked yet.")
             return
             
-        print(f"\n{'='*60}\n🎯 BOOKED ACTIVITIES\n{'='*60}")
+        print(f"\n{_SEP60}\n🎯 BOOKED ACTIVITIES\n{_SEP60}")
         total_cost = 0
         for i, activity in enumerate(travel_plan.activities, 1):
             print(f"{i}. {activity['name']} - {activity['category']}")
@@ -166,7 +224,7 @@ class ActivityService:
         
     def get_activities_summary(self, travel_plan: TravelPlan) -> str:
         """Return a summary of booked activities"""
-        if not travel_plan.activities or len(travel_plan.activities) == 0:
+        if not travel_plan.activities:
             return "No activities booked yet."
             
         summary = f"🎯 ACTIVITIES SUMMARY ({len(travel_plan.activities)} activities booked)\n"
@@ -179,65 +237,102 @@ class ActivityService:
         summary += f"\nTotal activities cost: ${total_cost:.2f}"
         return summary
         
+    def _build_suggestion_prompt(self, destination, budget):
+        """Build the activity suggestion prompt for a destination/budget pair"""
+        # Bucket the budget so nearby amounts share a cache entry
+        return f"""As a travel assistant, suggest 5 activities for the destination below,
+        staying within the traveler's total budget.
+
+        Return ONLY a JSON array of 5 objects with these keys:
+        - "name": activity name
+        - "price": approximate cost per person (number)
+        - "duration": time required (half-day/full-day)
+        - "value": why it's worth doing (one short phrase)
+        - "category": cultural, adventure, relaxation, etc.
+
+        No text outside the JSON array.
+
+        Destination: {destination}
+        Total budget: ${bucket_budget(budget):.2f}"""
+
     def get_activity_suggestions(self, destination, budget, days):
         """Get activity suggestions and return data instead of printing."""
         daily_budget = budget / days if days > 0 else budget
-        
-        # Generate suggestions using the LLM
-        prompt = f"""As a travel assistant, suggest 5 activities in {destination}
-        with a total budget of ${budget:.2f}. For each activity include:
-        - Activity name
-        - Approximate cost per person
-        - Time required (half-day/full-day)
-        - Why it's worth doing
-        - Category (cultural, adventure, relaxation, etc.)
-        
-        Format as a structured list with clear sections."""
-        
-        response = self.llm.invoke(prompt)
-        
-        # Parse the response into a structured format
+
+        response = self.cached_llm.invoke(self._build_suggestion_prompt(destination, budget),
+                                          max_tokens=_MAX_SUGGESTION_TOKENS)
+        return self._parse_activity_response(response, daily_budget)
+
+    async def aget_activity_suggestions(self, destination, budget, days):
+        """Async variant of get_activity_suggestions for concurrent fetches."""
+        daily_budget = budget / days if days > 0 else budget
+
+        response = await self.llm.ainvoke(self._build_suggestion_prompt(destination, budget),
+                                          max_tokens=_MAX_SUGGESTION_TOKENS)
+        return self._parse_activity_response(response, daily_budget)
+
+    async def ainvoke_batch(self, prompts: List[str]) -> List[str]:
+        """Run independent prompts concurrently and return their responses.
+
+        Wall-clock time approaches the slowest single call instead of the
+        sum, so callers can overlap activity/hotel/flight suggestions.
+        """
+        responses = await asyncio.gather(*[self.llm.ainvoke(p) for p in prompts])
+        return [str(r) for r in responses]
+
+    def _parse_activity_response(self, response, daily_budget):
+        """Parse an LLM suggestion response into a structured format"""
+        text = str(response)
+
+        # The prompt asks for a JSON array; decode it directly when possible
+        try:
+            items = json.loads(text[text.index('['):text.rindex(']') + 1])
+            options = [{
+                'option': i,
+                'name': item.get('name', f'Activity {i}'),
+                'price': float(item.get('price', daily_budget * 0.1 * i)),
+                'duration': item.get('duration', ''),
+                'value': item.get('value', ''),
+                'category': item.get('category', ''),
+            } for i, item in enumerate(items[:5], 1)]
+            if options:
+                return options
+        except (ValueError, TypeError, AttributeError):
+            pass
+
+        # Fall back to line-by-line parsing for free-text responses
         activity_options = []
         current_option = {}
         
-        for line in str(response).split('\n'):
+        for line in text.split('\n'):
             line = line.strip()
             if not line:
                 continue
-            
-            if line.startswith('1.') or line.startswith('Activity 1:'):
-                current_option = {'option': 1}
-                activity_options.append(current_option)
-            elif line.startswith('2.') or line.startswith('Activity 2:'):
-                current_option = {'option': 2}
-                activity_options.append(current_option)
-            elif line.startswith('3.') or line.startswith('Activity 3:'):
-                current_option = {'option': 3}
-                activity_options.append(current_option)
-            elif line.startswith('4.') or line.startswith('Activity 4:'):
-                current_option = {'option': 4}
-                activity_options.append(current_option)
-            elif line.startswith('5.') or line.startswith('Activity 5:'):
-                current_option = {'option': 5}
+
+            option_match = _OPTION_RE.match(line)
+            if option_match:
+                current_option = {'option': int(option_match.group('opt')
+                                                or option_match.group('opt2'))}
                 activity_options.append(current_option)
-            
-            # Parse activity details
+
+            # Parse activity details: one regex match dispatches to the field
             if 'option' in current_option:
                 if 'name' not in current_option and ':' not in line and len(line) > 5:
                     current_option['name'] = line
-                elif 'cost' in line.lower() or 'price' in line.lower() or '$' in line:
+                    continue
+                field_match = _FIELD_RE.search(line)
+                if field_match is None:
+                    continue
+                kind = field_match.lastgroup
+                if kind == 'price':
                     try:
                         price_text = line.split('$')[1].split()[0].replace(',', '')
                         current_option['price'] = float(price_text)
                     except:
                         # Estimate a price if parsing fails
                         current_option['price'] = daily_budget * (0.1 * current_option['option'])
-                elif 'duration' in line.lower() or 'time' in line.lower() or 'hour' in line.lower():
-                    current_option['duration'] = line.split(':')[-1].strip()
-                elif 'worth' in line.lower() or 'why' in line.lower():
-                    current_option['value'] = line.split(':')[-1].strip()
-                elif 'category' in line.lower() or 'type' in line.lower():
-                    current_option['category'] = line.split(':')[-1].strip()
+                else:
+                    current_option[kind] = line.split(':')[-1].strip()
         
         return activity_options
     
@@ -251,13 +346,13 @@ class ActivityService:
         Question: {question}
         
         Provide a helpful, detailed response about the activities."""
-        
-        response = self.llm.invoke(prompt)
+
+        response = self.cached_llm.invoke(prompt)
         return str(response)
 
     def modify_activities(self, travel_plan: TravelPlan) -> None:
         """Allow user to modify booked activities"""
-        if not travel_plan.activities or len(travel_plan.activities) == 0:
+        if not travel_plan.activities:
             print("No activities to modify.")
             return
             
@@ -274,7 +369,7 @@ class ActivityService:
             
             if choice == '1':
                 # Remove activity
-                if len(travel_plan.activities) == 0:
+                if not travel_plan.activities:
                     print("No activities to remove.")
                     continue
                     
@@ -0,0 +1,34 @@
+"""
+Shared airline carrier-code to name mapping
+"""
+from types import MappingProxyType
+from typing import Mapping
+
+# Single read-only mapping used by both the flight service and the API
+# wrappers; previously each kept its own (diverging) copy
+AIRLINE_NAMES: Mapping[str, str] = MappingProxyType({
+    'AA': 'American Airlines',
+    'AF': 'Air France',
+    'AY': 'Finnair',
+    'BA': 'British Airways',
+    'CX': 'Cathay Pacific',
+    'DL': 'Delta Air Lines',
+    'EK': 'Emirates',
+    'ET': 'Ethiopian Airlines',
+    'IB': 'Iberia',
+    'JL': 'Japan Airlines',
+    'KL': 'KLM',
+    'KQ': 'Kenya Airways',
+    'LH': 'Lufthansa',
+    'LX': 'Swiss International Air Lines',
+    'OS': 'Austrian Airlines',
+    'QF': 'Qantas',
+    'RB': 'Air Afrique',
+    'SQ': 'Singapore Airlines',
+    'TK': 'Turkish Airlines',
+    'UA': 'United Airlines',
+})
+
+# Bound once so hot formatting loops avoid a per-call attribute lookup;
+# use get_airline_name(code, code) to fall back to the raw code
+get_airline_name = AIRLINE_NAMES.get
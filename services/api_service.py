@@ -1,14 +1,82 @@
 """
 API service for external API interactions
 """
+import asyncio
+import difflib
+import json
+import os
+import threading
 import time
+from collections import OrderedDict
+from types import MappingProxyType
 import requests
 from typing import Dict, Optional, Any
 import googlemaps
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# rapidfuzz is a C++ implementation ~50-100x faster than difflib;
+# fall back to stdlib difflib if it is not installed
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+except ImportError:
+    fuzz = None
+    fuzz_process = None
+
+# Shared HTTP session: keeps the TLS connection to the Amadeus host warm
+# across token fetches, location lookups and flight searches. Transient
+# 5xx responses are retried on the pooled connection instead of forcing
+# callers into a cold reconnect.
+_AMADEUS_SESSION = requests.Session()
+_AMADEUS_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10, pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])))
+
+
+class LazyText:
+    """Defer decoding a response body until a log handler formats it"""
+    __slots__ = ('_response',)
+
+    def __init__(self, response):
+        self._response = response
+
+    def __str__(self) -> str:
+        return self._response.text
+
+
+class LRUCache:
+    """Small bounded LRU cache with hit/miss counters"""
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key):
+        """Return the cached value or None, refreshing recency on a hit"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        """Insert a value, evicting the least recently used entry if full"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
 
 
 class AmadeusTokenManager:
     """Responsible for managing Amadeus API tokens with better error handling"""
+
+    # On-disk token cache so a fresh process reuses a still-valid token
+    token_cache_path = os.path.expanduser('~/.cache/findtravel/amadeus.json')
+
     def __init__(self, client_id: str, client_secret: str):
         self.client_id = client_id
         self.client_secret = client_secret
@@ -16,13 +84,45 @@ class AmadeusTokenManager:
         self.expiry_time = 0
         self.max_retries = 3
         self.retry_delay = 2  # seconds
-    
+        self.session = _AMADEUS_SESSION
+        self._lock = threading.Lock()
+        self._load_cached_token()
+
+    def _load_cached_token(self) -> None:
+        """Restore a previously fetched token from disk if still valid"""
+        try:
+            with open(self.token_cache_path, 'r') as f:
+                cached = json.load(f)
+            if cached.get('token') and time.time() < cached.get('expiry_time', 0) - 300:
+                self.token = cached['token']
+                self.expiry_time = cached['expiry_time']
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def _save_cached_token(self) -> None:
+        """Persist the current token so it survives process restarts"""
+        try:
+            os.makedirs(os.path.dirname(self.token_cache_path), exist_ok=True)
+            with open(self.token_cache_path, 'w') as f:
+                json.dump({'token': self.token, 'expiry_time': self.expiry_time}, f)
+        except OSError as e:
+            print(f"Could not persist Amadeus token: {e}")
+
     def get_token(self) -> Optional[str]:
         """Get Amadeus API token with improved caching and retry logic"""
         # Return cached token if still valid (with 5-min buffer)
         if self.token and time.time() < (self.expiry_time - 300):
             return self.token
-            
+
+        # Double-checked locking: concurrent callers wait here, and whoever
+        # enters second finds the token the first fetch just cached
+        with self._lock:
+            if self.token and time.time() < (self.expiry_time - 300):
+                return self.token
+            return self._fetch_token()
+
+    def _fetch_token(self) -> Optional[str]:
+        """Fetch a fresh token from Amadeus (caller must hold the lock)"""
         url = "https://test.api.amadeus.com/v1/security/oauth2/token"
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
         data = {
@@ -35,11 +135,12 @@ class AmadeusTokenManager:
         retries = 0
         while retries < self.max_retries:
             try:
-                response = requests.post(url, headers=headers, data=data, timeout=5)
+                response = self.session.post(url, headers=headers, data=data, timeout=5)
                 if response.status_code == 200:
                     token_data = response.json()
                     self.token = token_data.get('access_token')
                     self.expiry_time = time.time() + token_data.get('expires_in', 1800)
+                    self._save_cached_token()
                     return self.token
                 elif response.status_code == 429:  # Rate limited
                     wait_time = int(response.headers.get('Retry-After', self.retry_delay * (2 ** retries)))
@@ -62,92 +163,184 @@ class AmadeusTokenManager:
 
 class LocationService:
     """Service for managing location data and lookups"""
+
+    # Special cases for locations that might be difficult to find;
+    # built once at import and shared read-only across instances
+    special_cases = MappingProxyType({
+        'abidjan': ('ABJ', 'Abidjan'),
+        'maroc': ('CMN', 'Casablanca'),
+        'casablanca': ('CMN', 'Casablanca'),
+        'kigali': ('KGL', 'Kigali'),
+        'nairobi': ('NBO', 'Nairobi'),
+        'dakar': ('DKR', 'Dakar')
+    })
+
     def __init__(self, google_maps_key: str, token_manager: AmadeusTokenManager):
         self.token_manager = token_manager
         self.google_maps_key = google_maps_key
-        self.location_cache = {}
-        
-        # Special cases for locations that might be difficult to find
-        self.special_cases = {
-            'abidjan': ('ABJ', 'Abidjan'),
-            'maroc': ('CMN', 'Casablanca'),
-            'casablanca': ('CMN', 'Casablanca'),
-            'kigali': ('KGL', 'Kigali'),
-            'nairobi': ('NBO', 'Nairobi'),
-            'dakar': ('DKR', 'Dakar')
-        }
-        
-    def find_iata_code(self, location_name: str) -> Optional[Dict[str, str]]:
-        """Find IATA code for global cities with improved recognition"""
-        import difflib
-        import googlemaps
-        
-        # Check cache first
-        if location_name.lower() in self.location_cache:
-            return self.location_cache[location_name.lower()]
-        
-        # Check special cases
-        lower_input = location_name.lower()
+        self.location_cache = LRUCache(maxsize=1024)
+        self._gmaps = None  # Google Maps client, built lazily on first use
+        self.session = token_manager.session
+
+    def _get_gmaps_client(self):
+        """Return the shared Google Maps client, creating it on first use"""
+        if self._gmaps is None:
+            self._gmaps = googlemaps.Client(key=self.google_maps_key)
+        return self._gmaps
+
+    def _check_local(self, lower_input: str) -> Optional[Dict[str, str]]:
+        """Check the cache and special-case table for a normalized name"""
+        cached = self.location_cache.get(lower_input)
+        if cached is not None:
+            return cached
+
         if lower_input in self.special_cases:
             result = {'iata': self.special_cases[lower_input][0], 'name': self.special_cases[lower_input][1]}
-            self.location_cache[lower_input] = result
+            self.location_cache.put(lower_input, result)
             return result
-            
-        # Try Amadeus API first
+
+        return None
+
+    def _amadeus_lookup(self, location_name: str) -> Optional[Dict[str, str]]:
+        """Look up a location through the Amadeus reference-data API"""
         token = self.token_manager.get_token()
-        if token:
-            headers = {"Authorization": f"Bearer {token}"}
-            params = {
-                "subType": "CITY,AIRPORT",
-                "keyword": location_name,
-                "page[limit]": 5
-            }
-            try:
-                response = requests.get(
-                    "https://test.api.amadeus.com/v1/reference-data/locations",
-                    headers=headers,
-                    params=params
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('data'):
-                        best_match = self._find_best_match(location_name, data['data'])
-                        result = {
-                            'iata': best_match['iataCode'],
-                            'name': best_match['name']
-                        }
-                        self.location_cache[lower_input] = result
-                        return result
-            except Exception as e:
-                print(f"API Amadeus error: {e}")
-                
-        # Fallback to Google Maps
+        if not token:
+            return None
+
+        headers = {"Authorization": f"Bearer {token}"}
+        params = {
+            "subType": "CITY,AIRPORT",
+            "keyword": location_name,
+            "page[limit]": 5
+        }
+        try:
+            response = self.session.get(
+                "https://test.api.amadeus.com/v1/reference-data/locations",
+                headers=headers,
+                params=params,
+                timeout=(3.05, 10)
+            )
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('data'):
+                    best_match = self._find_best_match(location_name, data['data'])
+                    return {
+                        'iata': best_match['iataCode'],
+                        'name': best_match['name']
+                    }
+        except Exception as e:
+            print(f"API Amadeus error: {e}")
+
+        return None
+
+    def _gmaps_city_name(self, location_name: str) -> Optional[str]:
+        """Resolve a free-form location to a city name via Google Maps"""
         try:
-            gmaps = googlemaps.Client(key=self.google_maps_key)
-            geocode_result = gmaps.geocode(location_name)
+            geocode_result = self._get_gmaps_client().geocode(location_name)
             if geocode_result:
                 for component in geocode_result[0]['address_components']:
                     if 'locality' in component['types'] or 'administrative_area_level_1' in component['types']:
-                        city_name = component['long_name']
-                        return self.find_iata_code(city_name)  # Try again with the city name
+                        return component['long_name']
         except Exception as e:
             print(f"Google Maps error: {e}")
-            
+
         return None
-        
+
+    def find_iata_code(self, location_name: str) -> Optional[Dict[str, str]]:
+        """Find IATA code for global cities with improved recognition"""
+        # Check cache first (casefold handles Unicode-aware lowering)
+        lower_input = location_name.casefold()
+        result = self._check_local(lower_input)
+        if result is not None:
+            return result
+
+        # Try Amadeus API first
+        result = self._amadeus_lookup(location_name)
+        if result is not None:
+            self.location_cache.put(lower_input, result)
+            return result
+
+        # Fallback to Google Maps (shared client keeps the HTTPS session alive)
+        city_name = self._gmaps_city_name(location_name)
+        if city_name and city_name.casefold() != lower_input:
+            return self.find_iata_code(city_name)  # Try again with the city name
+
+        return None
+
+    async def afind_iata_code(self, location_name: str) -> Optional[Dict[str, str]]:
+        """Async lookup racing the Amadeus and Google Maps backends.
+
+        The sync path tries Amadeus then Google strictly in order; here both
+        start at once, so unknown locations pay roughly the faster backend's
+        latency instead of the sum of both.
+        """
+        lower_input = location_name.casefold()
+        result = self._check_local(lower_input)
+        if result is not None:
+            return result
+
+        amadeus_task = asyncio.create_task(asyncio.to_thread(self._amadeus_lookup, location_name))
+        gmaps_task = asyncio.create_task(asyncio.to_thread(self._gmaps_city_name, location_name))
+        await asyncio.wait({amadeus_task, gmaps_task},
+                           return_when=asyncio.FIRST_COMPLETED, timeout=3)
+
+        # Prefer the Amadeus answer whenever it arrives
+        result = await amadeus_task
+        if result is None:
+            try:
+                city_name = await gmaps_task
+            except asyncio.CancelledError:
+                city_name = None
+            if city_name and city_name.casefold() != lower_input:
+                result = await asyncio.to_thread(self._amadeus_lookup, city_name)
+        else:
+            gmaps_task.cancel()
+
+        if result is not None:
+            self.location_cache.put(lower_input, result)
+        return result
+
+    async def find_iata_codes(self, names: list) -> Dict[str, Optional[Dict[str, str]]]:
+        """Resolve several location names concurrently.
+
+        Lookups are I/O bound, so firing them together brings the wall-clock
+        cost of a full itinerary (origin, destination, layovers) close to a
+        single request. A semaphore bounds concurrency to stay under the
+        provider rate limit, and duplicate names are resolved only once.
+        """
+        semaphore = asyncio.Semaphore(8)
+
+        async def bounded_lookup(name):
+            async with semaphore:
+                return await self.afind_iata_code(name)
+
+        unique_names = list(dict.fromkeys(names))
+        results = await asyncio.gather(*(bounded_lookup(name) for name in unique_names))
+        resolved = dict(zip(unique_names, results))
+        return {name: resolved[name] for name in names}
+
     def _find_best_match(self, input_name: str, locations: list) -> Dict:
         """Find best match using similarity algorithm"""
-        import difflib
-        
         input_name = input_name.lower()
+        names = [loc['name'].lower() for loc in locations]
+
+        # Exact match wins outright - no need to score the rest
+        try:
+            return locations[names.index(input_name)]
+        except ValueError:
+            pass
+
+        # Score the whole candidate list in one C call when rapidfuzz is
+        # available; this keeps the inner loop out of the interpreter even
+        # for large result pages
+        if fuzz_process is not None:
+            _, _, index = fuzz_process.extractOne(input_name, names, scorer=fuzz.WRatio)
+            return locations[index]
+
         best_score = 0
         best_match = locations[0]
-
-        for loc in locations:
-            loc_name = loc['name'].lower()
+        for loc, loc_name in zip(locations, names):
             score = difflib.SequenceMatcher(None, input_name, loc_name).ratio()
-            if input_name == loc_name:
-                score += 0.5
             if score > best_score:
                 best_score = score
                 best_match = loc
@@ -1,32 +1,89 @@
 """
 API wrapper functions for use in the CLI
 """
+import logging
+import time
+from types import MappingProxyType
 from typing import Dict, Optional, Any, List
-import requests
 from models.travel_plan import TravelPlan
-from services.api_service import AmadeusTokenManager
+import requests
+from services.airline_codes import AIRLINE_NAMES
+from services.api_service import AmadeusTokenManager, LazyText
 from config import load_api_keys
 
+logger = logging.getLogger(__name__)
+
+# orjson decodes large nested responses noticeably faster; fall back to the
+# stdlib decoder if it is not installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    from json import loads as _loads
+
+# Endpoint and static query fields, shared across all searches
+_AMADEUS_FLIGHT_URL = "https://test.api.amadeus.com/v2/shopping/flight-offers"
+_BASE_PARAMS = MappingProxyType({"currencyCode": "USD", "max": 5})
+
 # Initialize API clients
 _api_keys = load_api_keys()
 _token_manager = AmadeusTokenManager(
     _api_keys.get('amadeus_client_id', ''),
     _api_keys.get('amadeus_client_secret', '')
 )
+# Pooled session shared with the token manager: keep-alive avoids a new
+# TCP+TLS handshake on every Amadeus call
+_session = _token_manager.session
+
+# Recent search results keyed by the normalized query tuple. max_price is
+# deliberately not part of the key: a budget change filters the cached
+# result locally instead of re-fetching.
+_FLIGHT_CACHE_TTL = 600  # seconds
+_flight_cache: Dict[tuple, tuple] = {}
+
+# Display separators, built once instead of per option
+_SEP50 = '=' * 50
+_SEP60 = '=' * 60
+
+# Star ratings and per-item display templates, built once at import so the
+# format structure is not re-parsed on every call
+_STARS = ('', '⭐', '⭐⭐', '⭐⭐⭐', '⭐⭐⭐⭐', '⭐⭐⭐⭐⭐')
+_HOTEL_TMPL = ("OPTION {i}: {name} ({stars})\n"
+               "Location: {area}\n"
+               "Breakfast: {breakfast}\n"
+               "Price: ${price:.2f} total for {nights} nights\n"
+               "Features: {features}\n\n")
+_ACTIVITY_TMPL = ("OPTION {i}: {name}\n"
+                  "Cost: ${cost:.2f} per person\n"
+                  "Duration: {duration}\n"
+                  "Why it's worth it: {value}\n"
+                  "Category: {category}\n\n")
+
+# Simulated option tables: only the destination name and the price vary per
+# call, so everything else lives at module scope.
+# (name template, stars, area, breakfast, price factor, features)
+_HOTEL_SPECS = (
+    ("{} Grand Hotel", 4, "City Center", "Included", 0.9,
+     "Rooftop pool, spa, and central location"),
+    ("{} Boutique Inn", 3, "Historic District", "Available for purchase", 0.75,
+     "Charming historic building with local character"),
+    ("Luxury Suites {}", 5, "Marina/Waterfront", "Gourmet breakfast included", 1.1,
+     "Spacious suites with stunning views"),
+)
 
-# Airline names mapping for display
-AIRLINE_NAMES = {
-    'AF': 'Air France',
-    'DL': 'Delta Airlines',
-    'BA': 'British Airways',
-    'AA': 'American Airlines',
-    'LH': 'Lufthansa',
-    'EK': 'Emirates',
-    'TK': 'Turkish Airlines',
-    'ET': 'Ethiopian Airlines',
-    'KQ': 'Kenya Airways',
-    'RB': 'Air Afrique'
-}
+# (name template, cost factor of daily budget, duration, value, category)
+_ACTIVITY_SPECS = (
+    ("{} City Tour", 0.2, "Half-day",
+     "Perfect introduction to the city's major landmarks", "Cultural"),
+    ("{} Food Experience", 0.15, "3 hours",
+     "Sample local cuisine with a knowledgeable guide", "Culinary"),
+    ("Day Trip to Surrounding Areas", 0.4, "Full-day",
+     "Explore beyond the city to see natural wonders", "Adventure"),
+    ("Local Museum Pass", 0.1, "Flexible",
+     "Access to the city's top museums at your own pace", "Cultural"),
+    ("Evening Entertainment", 0.25, "3 hours",
+     "Experience local performing arts or nightlife", "Entertainment"),
+)
 
 def search_flights(departure_iata: str, destination_iata: str, departure_date: str, 
                   return_date: str, travelers: int, max_price: float) -> Optional[Dict]:
@@ -44,36 +101,67 @@ def search_flights(departure_iata: str, destination_iata: str, departure_date: s
     Returns:
         Flight data dictionary or None if no results
     """
-    
+    cache_key = (departure_iata, destination_iata, departure_date,
+                 return_date, int(travelers))
+    entry = _flight_cache.get(cache_key)
+    if entry and time.monotonic() - entry[0] < _FLIGHT_CACHE_TTL:
+        return filter_flights_by_budget(entry[1], max_price)
+
     token = _token_manager.get_token()
     if not token:
         return None
 
     headers = {"Authorization": f"Bearer {token}"}
+    # maxPrice is applied locally below so that a later budget change can
+    # reuse the cached response; static fields come from the shared skeleton
     params = {
+        **_BASE_PARAMS,
         "originLocationCode": departure_iata,
         "destinationLocationCode": destination_iata,
         "departureDate": departure_date,
         "returnDate": return_date,
-        "adults": travelers,
-        "maxPrice": int(max_price),
-        "currencyCode": "USD",
-        "max": 5
+        "adults": travelers
     }
 
-    url = "https://test.api.amadeus.com/v2/shopping/flight-offers"
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = _session.get(_AMADEUS_FLIGHT_URL, headers=headers, params=params, timeout=(3.05, 10))
         if response.status_code == 200:
-            return response.json()
+            # Decode the bytes directly; skips requests' encoding sniffing
+            result = _loads(response.content)
+            _flight_cache[cache_key] = (time.monotonic(), result)
+            return filter_flights_by_budget(result, max_price)
         else:
-            print(f"Error searching flights: {response.text}")
+            # Lazy wrapper: the error body is only decoded if a handler
+            # actually formats this record
+            logger.error("Error searching flights: %s", LazyText(response))
             return None
-    except Exception as e:
-        print(f"Network error searching flights: {e}")
+    except requests.exceptions.Timeout:
+        logger.error("Flight search timed out")
+        return None
+    except Exception:
+        logger.exception("Network error searching flights")
         return None
 
 
+def filter_flights_by_budget(flight_data: Optional[Dict], max_price: float) -> Optional[Dict]:
+    """
+    Keep only the flight offers priced within max_price
+    
+    Args:
+        flight_data: Raw flight data from API
+        max_price: Maximum total price per offer
+        
+    Returns:
+        Copy of flight_data with offers above max_price removed
+    """
+    if not flight_data or 'data' not in flight_data:
+        return flight_data
+    trimmed = dict(flight_data)
+    trimmed['data'] = [offer for offer in flight_data['data']
+                       if float(offer['price']['total']) <= max_price]
+    return trimmed
+
+
 def format_flight_data(flight_data: Optional[Dict], travel_plan: TravelPlan) -> str:
     """
     Format flight data with smart fallback suggestions
@@ -95,41 +183,52 @@ Current search parameters:
 - Budget: ${travel_plan.total_budget}
 - Travelers: {travel_plan.travelers}"""
 
-    formatted = []
+    # Collect parts and join once: += string building can degrade to
+    # O(n^2) when CPython's in-place buffer optimization misses
+    formatted: List[str] = []
     for i, option in enumerate(flight_data['data'][:3], 1):
-        flight_info = f"\n{'='*50}\n[OPTION {i}]\n{'='*50}\n"
-        flight_info += f"💰 Total Price: ${float(option['price']['total']):.2f}\n"
+        parts: List[str] = []
+        parts.append(f"\n{_SEP50}\n[OPTION {i}]\n{_SEP50}\n")
+        parts.append(f"💰 Total Price: ${float(option['price']['total']):.2f}\n")
 
-        outbound = option['itineraries'][0]
-        flight_info += f"\n✈️ OUTBOUND ({outbound['duration']}):\n"
-        flight_info += f"  {travel_plan.departure['name']} → {travel_plan.destination['name']}\n"
-        flight_info += f"  Airline: {AIRLINE_NAMES.get(outbound['segments'][0]['carrierCode'], outbound['segments'][0]['carrierCode'])}\n"
-        flight_info += f"  Stops: {len(outbound['segments'])-1}\n"
+        itins = option['itineraries']
+        outbound = itins[0]
+        out_segments = outbound['segments']
+        out_carrier = out_segments[0]['carrierCode']
+        parts.append(f"\n✈️ OUTBOUND ({outbound['duration']}):\n")
+        parts.append(f"  {travel_plan.departure['name']} → {travel_plan.destination['name']}\n")
+        parts.append(f"  Airline: {AIRLINE_NAMES.get(out_carrier, out_carrier)}\n")
+        parts.append(f"  Stops: {len(out_segments)-1}\n")
 
-        for seg in outbound['segments']:
-            flight_info += f"\n  • {seg['departure']['iataCode']} → {seg['arrival']['iataCode']}\n"
-            flight_info += f"    Depart: {seg['departure']['at'][11:16]} | Arrive: {seg['arrival']['at'][11:16]}\n"
-            flight_info += f"    Flight: {seg['carrierCode']}{seg['number']} | Duration: {seg.get('duration', 'N/A')}\n"
+        for seg in out_segments:
+            # One lookup per nested dict; the locals are then plain loads
+            dep, arr = seg['departure'], seg['arrival']
+            parts.append(f"\n  • {dep['iataCode']} → {arr['iataCode']}\n")
+            parts.append(f"    Depart: {dep['at'][11:16]} | Arrive: {arr['at'][11:16]}\n")
+            parts.append(f"    Flight: {seg['carrierCode']}{seg['number']} | Duration: {seg.get('duration', 'N/A')}\n")
 
-        if len(option['itineraries']) > 1:
-            return_flight = option['itineraries'][1]
-            flight_info += f"\n🛬 RETURN ({return_flight['duration']}):\n"
-            flight_info += f"  {travel_plan.destination['name']} → {travel_plan.departure['name']}\n"
-            flight_info += f"  Airline: {AIRLINE_NAMES.get(return_flight['segments'][0]['carrierCode'], return_flight['segments'][0]['carrierCode'])}\n"
-            flight_info += f"  Stops: {len(return_flight['segments']) -1}\n"
+        if len(itins) > 1:
+            return_flight = itins[1]
+            ret_segments = return_flight['segments']
+            ret_carrier = ret_segments[0]['carrierCode']
+            parts.append(f"\n🛬 RETURN ({return_flight['duration']}):\n")
+            parts.append(f"  {travel_plan.destination['name']} → {travel_plan.departure['name']}\n")
+            parts.append(f"  Airline: {AIRLINE_NAMES.get(ret_carrier, ret_carrier)}\n")
+            parts.append(f"  Stops: {len(ret_segments) -1}\n")
 
-            for seg in return_flight['segments']:
-                flight_info += f"\n  • {seg['departure']['iataCode']} → {seg['arrival']['iataCode']}\n"
-                flight_info += f"    Depart: {seg['departure']['at'][11:16]} | Arrive: {seg['arrival']['at'][11:16]}\n"
-                flight_info += f"    Flight: {seg['carrierCode']}{seg['number']} | Duration: {seg.get('duration', 'N/A')}\n"
+            for seg in ret_segments:
+                dep, arr = seg['departure'], seg['arrival']
+                parts.append(f"\n  • {dep['iataCode']} → {arr['iataCode']}\n")
+                parts.append(f"    Depart: {dep['at'][11:16]} | Arrive: {arr['at'][11:16]}\n")
+                parts.append(f"    Flight: {seg['carrierCode']}{seg['number']} | Duration: {seg.get('duration', 'N/A')}\n")
 
-        formatted.append(flight_info)
+        formatted.append(''.join(parts))
 
-    header = f"\n{'='*60}\n✈️ AVAILABLE FLIGHTS\n{'='*60}"
-    header += f"\nFrom: {travel_plan.departure['name']} → To: {travel_plan.destination['name']}"
-    header += f"\nDates: {travel_plan.departure_date} to {travel_plan.return_date}\n"
+    header = (f"\n{_SEP60}\n✈️ AVAILABLE FLIGHTS\n{_SEP60}"
+              f"\nFrom: {travel_plan.departure['name']} → To: {travel_plan.destination['name']}"
+              f"\nDates: {travel_plan.departure_date} to {travel_plan.return_date}\n")
 
-    return header + '\n'.join(formatted) + f"\n{'='*60}"
+    return header + '\n'.join(formatted) + f"\n{_SEP60}"
 
 def get_hotel_suggestions(destination: str, budget: float, nights: int, travelers: int = 1) -> str:
     """
@@ -148,44 +247,15 @@ def get_hotel_suggestions(destination: str, budget: float, nights: int, traveler
     # These would normally come from an API, but we're simulating the response
     # to avoid dependency on external APIs
     price_per_night = budget / (nights * 1.5)  # Allow some budget for activities
-    
-    hotels = [
-        {
-            "name": f"{destination} Grand Hotel",
-            "stars": 4,
-            "area": "City Center",
-            "breakfast": "Included",
-            "price": price_per_night * nights * 0.9,
-            "features": "Rooftop pool, spa, and central location"
-        },
-        {
-            "name": f"{destination} Boutique Inn",
-            "stars": 3,
-            "area": "Historic District",
-            "breakfast": "Available for purchase",
-            "price": price_per_night * nights * 0.75,
-            "features": "Charming historic building with local character"
-        },
-        {
-            "name": f"Luxury Suites {destination}",
-            "stars": 5,
-            "area": "Marina/Waterfront",
-            "breakfast": "Gourmet breakfast included",
-            "price": price_per_night * nights * 1.1,
-            "features": "Spacious suites with stunning views"
-        }
-    ]
-    
-    # Format hotel information
-    result = ""
-    for i, hotel in enumerate(hotels, 1):
-        result += f"OPTION {i}: {hotel['name']} ({'⭐' * hotel['stars']})\n"
-        result += f"Location: {hotel['area']}\n"
-        result += f"Breakfast: {hotel['breakfast']}\n"
-        result += f"Price: ${hotel['price']:.2f} total for {nights} nights\n"
-        result += f"Features: {hotel['features']}\n\n"
-    
-    return result
+    base = price_per_night * nights
+
+    return ''.join(
+        _HOTEL_TMPL.format(i=i, name=name_t.format(destination),
+                           stars=_STARS[stars], area=area,
+                           breakfast=breakfast, price=base * factor,
+                           nights=nights, features=features)
+        for i, (name_t, stars, area, breakfast, factor, features)
+        in enumerate(_HOTEL_SPECS, 1))
 
 def get_activity_suggestions(destination: str, budget: float, days: int) -> str:
     """
@@ -202,52 +272,10 @@ def get_activity_suggestions(destination: str, budget: float, days: int) -> str:
     """
     # These would normally come from an API, but we're simulating the response
     daily_budget = budget / days
-    
-    activities = [
-        {
-            "name": f"{destination} City Tour",
-            "cost": daily_budget * 0.2,
-            "duration": "Half-day",
-            "value": "Perfect introduction to the city's major landmarks",
-            "category": "Cultural"
-        },
-        {
-            "name": f"{destination} Food Experience",
-            "cost": daily_budget * 0.15,
-            "duration": "3 hours",
-            "value": "Sample local cuisine with a knowledgeable guide",
-            "category": "Culinary"
-        },
-        {
-            "name": f"Day Trip to Surrounding Areas",
-            "cost": daily_budget * 0.4,
-            "duration": "Full-day",
-            "value": "Explore beyond the city to see natural wonders",
-            "category": "Adventure"
-        },
-        {
-            "name": "Local Museum Pass",
-            "cost": daily_budget * 0.1,
-            "duration": "Flexible",
-            "value": "Access to the city's top museums at your own pace",
-            "category": "Cultural"
-        },
-        {
-            "name": "Evening Entertainment",
-            "cost": daily_budget * 0.25,
-            "duration": "3 hours",
-            "value": "Experience local performing arts or nightlife",
-            "category": "Entertainment"
-        }
-    ]
-    
-    # Format activity information
-    result = ""
-    for i, activity in enumerate(activities, 1):
-        result += f"OPTION {i}: {activity['name']}\n"
-        result += f"Cost: ${activity['cost']:.2f} per person\n"
-        result += f"Duration: {activity['duration']}\n"
-        result += f"Why it's worth it: {activity['value']}\n"
-        result += f"Category: {activity['category']}\n\n"
-    
-    return result
\ No newline at end of file
+
+    return ''.join(
+        _ACTIVITY_TMPL.format(i=i, name=name_t.format(destination),
+                              cost=daily_budget * factor, duration=duration,
+                              value=value, category=category)
+        for i, (name_t, factor, duration, value, category)
+        in enumerate(_ACTIVITY_SPECS, 1))
\ No newline at end of file
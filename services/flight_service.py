@@ -1,78 +1,110 @@
 """
 Flight service for managing flight-related operations
 """
-from typing import Dict, Optional, Any, List
+import logging
+import time
 import requests
-from datetime import datetime
-from services.api_service import AmadeusTokenManager, LocationService
-from models.travel_plan import TravelPlan
-from langchain_core.prompts import PromptTemplate
-from langchain.chains import LLMChain
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Optional, Any, List
+from datetime import date, datetime, timedelta
+from services.airline_codes import AIRLINE_NAMES, get_airline_name
+from services.api_service import AmadeusTokenManager, LazyText, LocationService
+from models.travel_plan import FlightBooking, TravelPlan
 from utils.date_utils import validate_date_format as validate_date
 from utils.input_utils import get_numeric_input, get_date_input
 
+# orjson decodes large nested responses noticeably faster; fall back to the
+# stdlib decoder if it is not installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    from json import loads as _loads
+
+logger = logging.getLogger(__name__)
+
+# Endpoint and static query fields, shared across all searches
+_AMADEUS_FLIGHT_URL = "https://test.api.amadeus.com/v2/shopping/flight-offers"
+_BASE_PARAMS = MappingProxyType({"currencyCode": "USD", "max": 3})
+
+# Recent search results keyed by the normalized query tuple, so re-running
+# the same search (e.g. after a budget change in the no-flights dialog)
+# skips the network round trip entirely
+_FLIGHT_CACHE_TTL = 600  # seconds
+_flight_cache: Dict[tuple, tuple] = {}
+
+# Per-segment display line, shared by the outbound and return loops
+_SEGMENT_TMPL = "• {dep} → {arr} ({dt} → {at})\n"
+
+# Follow-up question prompt, defined once at import instead of per search
+_INQUIRY_TEMPLATE = """You're a helpful flight booking assistant.
+The user has flight options as follows:
+
+{flight_options}
+
+The user's question or input is: {question}
+
+If the user appears to be selecting a flight option (mentioning options like 'Option 1' or similar), inform them to use the number-only input to make a selection.
+Otherwise, provide a detailed and helpful response about the flight options specifically addressing the user's question."""
+
 
 class FlightService:
     """Service for flight search and booking"""
-    
-    # Airline names mapping
-    AIRLINE_NAMES = {
-        'AA': 'American Airlines',
-        'DL': 'Delta Air Lines',
-        'UA': 'United Airlines',
-        'AF': 'Air France',
-        'BA': 'British Airways',
-        'LH': 'Lufthansa',
-        'EK': 'Emirates',
-        'SQ': 'Singapore Airlines',
-        'QF': 'Qantas',
-        'CX': 'Cathay Pacific',
-        'JL': 'Japan Airlines',
-        'AY': 'Finnair',
-        'IB': 'Iberia',
-        'KL': 'KLM',
-        'OS': 'Austrian Airlines',
-        'LX': 'Swiss International Air Lines'
-    }
-    
+
+    # Shared carrier-code mapping (kept as a class attribute for callers
+    # that reference FlightService.AIRLINE_NAMES)
+    AIRLINE_NAMES = AIRLINE_NAMES
+
     def __init__(self, amadeus_client_id: str, amadeus_client_secret: str, google_maps_key: str, llm: Any):
         self.amadeus_token_manager = AmadeusTokenManager(amadeus_client_id, amadeus_client_secret)
         self.location_service = LocationService(
             google_maps_key = google_maps_key,
             token_manager=self.amadeus_token_manager)
         self.llm = llm
+        # Pooled session shared with the token manager, so flight searches
+        # reuse the warm TLS connection instead of reconnecting each time
+        self._session = self.amadeus_token_manager.session
         self.access_token = self.amadeus_token_manager.get_token()
+        if self.access_token:
+            # Authorization rides on the session's default headers so each
+            # search skips rebuilding a headers dict and Bearer string
+            self._session.headers["Authorization"] = f"Bearer {self.access_token}"
+        # Background searches that warm the cache during user think time
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=2)
+        # Memoized format_flight_data output for the current search
+        self._format_cache: Dict[tuple, str] = {}
+        # Last successful result set, reused when only the budget changes
+        self._last_flight_options: Optional[Dict] = None
         
     def search_flights(self, travel_plan: TravelPlan) -> None:
         """Search flights using the Amadeus API"""
         # Ensure we have tokens and valid inputs
         if not self._validate_search_criteria(travel_plan):
             return
-            
-        # Get flight data from Amadeus
+
+        # New search: stale formatted output must not leak into it
+        self._format_cache.clear()
+
+
+        # Fetch the flight data
         flight_options = self.search_amadeus_flights(travel_plan)
-        
+
         if flight_options and 'data' in flight_options and flight_options['data']:
+            self._last_flight_options = flight_options
             # Format the flight data
             formatted_flights = self.format_flight_data(flight_options, travel_plan)
             
             # Display the flight options to the user
             print(f"Here are your flight options from {travel_plan.departure['name']} to {travel_plan.destination['name']}:\n\n{formatted_flights}")
             
-            # Use a direct prompt template approach instead of chains with memory
-            inquiry_template = """You're a helpful flight booking assistant.
-            The user has flight options as follows:
-            
-            {flight_options}
-            
-            The user's question or input is: {question}
-            
-            If the user appears to be selecting a flight option (mentioning options like 'Option 1' or similar), inform them to use the number-only input to make a selection.
-            Otherwise, provide a detailed and helpful response about the flight options specifically addressing the user's question."""
-            
             # Display booking options
             print("\nSelect a flight to book or ask questions about the options.")
             print("Enter 'X' to skip flight booking (not recommended).")
+
+            # While the user reads the options, warm the cache for the
+            # adjacent travel dates they are most likely to ask about next
+            self._prefetch_adjacent_dates(travel_plan)
             
             while True:
                 user_input = input("\nChoice (1-3) or question: ").strip().upper()
@@ -97,11 +129,13 @@ class FlightService:
                             confirm = input("Confirm booking? (y/n): ").lower()
                             
                             if confirm == 'y':
-                                travel_plan.flights = {
-                                    'option': int(user_input),
-                                    'price': price,
-                                    'details': self.format_flight_data(flight_options, travel_plan)
-                                }
+                                # Reuse the listing formatted above rather
+                                # than re-walking every itinerary
+                                travel_plan.flights = FlightBooking(
+                                    option=int(user_input),
+                                    price=price,
+                                    details=formatted_flights
+                                )
                                 travel_plan.remaining_budget -= price
                                 print(f"✅ Flight booked! Remaining budget: ${travel_plan.remaining_budget:.2f}")
                                 break
@@ -119,7 +153,7 @@ class FlightService:
                         print(f"Invalid option. Please select a number between 1 and {len(flight_options['data'])}.")
                 else:
                     # Use direct prompt instead of chain with memory
-                    filled_prompt = inquiry_template.format(
+                    filled_prompt = _INQUIRY_TEMPLATE.format(
                         flight_options=formatted_flights,
                         question=user_input
                     )
@@ -130,102 +164,151 @@ class FlightService:
             # No flights found - show modification options
             self._handle_no_flights_found(travel_plan)
     
-    def search_amadeus_flights(self, travel_plan: TravelPlan) -> Dict:
+    def _prefetch_adjacent_dates(self, travel_plan: TravelPlan) -> None:
+        """Warm the search cache for one day earlier and later.
+
+        Runs in background threads so the blocking input() loop overlaps
+        with the network round trips; a later search for those dates is
+        then served straight from the TTL cache.
+        """
+        try:
+            dep = date.fromisoformat(travel_plan.departure_date)
+            ret = date.fromisoformat(travel_plan.return_date)
+        except (TypeError, ValueError):
+            return
+
+        for delta in (timedelta(days=-1), timedelta(days=1)):
+            shifted = TravelPlan.from_dict(travel_plan.to_dict())
+            shifted.departure_date = (dep + delta).isoformat()
+            shifted.return_date = (ret + delta).isoformat()
+            self._prefetch_executor.submit(self.search_amadeus_flights, shifted, True)
+
+    def search_amadeus_flights(self, travel_plan: TravelPlan, quiet: bool = False) -> Dict:
         """Search flights using the Amadeus API"""
         # Ensure we have valid tokens
         if not self.access_token:
             self.access_token = self.amadeus_token_manager.get_token()
             
         if not self.access_token:
-            print("⚠️ Unable to authenticate with Amadeus API")
+            if not quiet:
+                print("⚠️ Unable to authenticate with Amadeus API")
             return {}
-            
+
+        if "Authorization" not in self._session.headers:
+            self._session.headers["Authorization"] = f"Bearer {self.access_token}"
+
+
         # Get the IATA codes from the travel plan
         origin = travel_plan.departure.get('iata')
         destination = travel_plan.destination.get('iata')
-        
-        # Prepare API parameters
-        url = "https://test.api.amadeus.com/v2/shopping/flight-offers"
-        
-        headers = {
-            "Authorization": f"Bearer {self.access_token}"
-        }
-        
+
+        # Serve a recent identical search from the cache (budget is not part
+        # of the key - affordability is checked locally on the results)
+        cache_key = (origin, destination, travel_plan.departure_date,
+                     travel_plan.return_date, int(travel_plan.travelers or 1))
+        entry = _flight_cache.get(cache_key)
+        if entry and time.monotonic() - entry[0] < _FLIGHT_CACHE_TTL:
+            return entry[1]
+
+        # Merge the static skeleton with the per-call fields in one step
         params = {
+            **_BASE_PARAMS,
             "originLocationCode": origin,
             "destinationLocationCode": destination,
             "departureDate": travel_plan.departure_date,
             "returnDate": travel_plan.return_date,
-            "adults": travel_plan.travelers,
-            "max": 3,  # Limit to 3 options for simplicity
-            "currencyCode": "USD"
+            "adults": travel_plan.travelers
         }
         
         try:
-            print(f"\n🔍 Searching for flights from {origin} to {destination}...")
-            response = requests.get(url, headers=headers, params=params)
-            
+            if not quiet:
+                print(f"\n🔍 Searching for flights from {origin} to {destination}...")
+            response = self._session.get(_AMADEUS_FLIGHT_URL, params=params, timeout=(3.05, 10))
+
             if response.status_code == 200:
-                return response.json()
+                # Decode the bytes directly; skips requests' encoding sniffing
+                result = _loads(response.content)
+                _flight_cache[cache_key] = (time.monotonic(), result)
+                return result
             elif response.status_code == 401:
-                # Token expired, refresh and try again
-                print("Token expired. Refreshing...")
+                # Token expired, refresh the session header and try again
+                if not quiet:
+                    print("Token expired. Refreshing...")
                 self.access_token = self.amadeus_token_manager.get_token()
                 
                 if self.access_token:
-                    headers["Authorization"] = f"Bearer {self.access_token}"
-                    response = requests.get(url, headers=headers, params=params)
-                    
+                    self._session.headers["Authorization"] = f"Bearer {self.access_token}"
+                    response = self._session.get(_AMADEUS_FLIGHT_URL, params=params, timeout=(3.05, 10))
+
                     if response.status_code == 200:
-                        return response.json()
+                        result = _loads(response.content)
+                        _flight_cache[cache_key] = (time.monotonic(), result)
+                        return result
             
-            print(f"⚠️ API Error: {response.status_code} - {response.text}")
+            # Lazy wrapper: the error body is only decoded if a handler
+            # actually formats this record
+            logger.error("Amadeus API error %s: %s",
+                         response.status_code, LazyText(response))
             return {}
             
-        except Exception as e:
-            print(f"⚠️ Error searching flights: {str(e)}")
+        except requests.exceptions.Timeout:
+            # Distinguish a slow endpoint from a hard network failure so the
+            # caller can degrade gracefully instead of re-searching
+            logger.error("Amadeus flight search timed out")
+            return {}
+        except Exception:
+            logger.exception("Error searching flights")
             return {}
             
     def format_flight_data(self, flight_data: Dict, travel_plan: TravelPlan) -> str:
         """Format flight data in a readable way"""
         if not flight_data or 'data' not in flight_data or not flight_data['data']:
             return "No flights found."
-            
-        formatted = ""
+
+        # Same offers and plan state produce the same string, so repeated
+        # formatting of one result set is a dict lookup
+        cache_key = (id(flight_data), travel_plan.departure_date,
+                     travel_plan.return_date, travel_plan.remaining_budget)
+        cached = self._format_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+
+        # Collect parts and join once: += string building can degrade to
+        # O(n^2) when CPython's in-place buffer optimization misses.
+        # Local aliases keep attribute/method lookups out of the hot loop.
+        parts: List[str] = []
+        airline_lookup = get_airline_name
+        append = parts.append
         for i, option in enumerate(flight_data['data'][:3], 1):
             price = float(option['price']['total'])
             price_status = "✅ Within budget" if price <= travel_plan.remaining_budget else "❌ Exceeds budget"
             
-            formatted += f"[OPTION {i}] ${price:.2f} {price_status}\n"
-            
-            # Format outbound flight
-            outbound = option['itineraries'][0]
-            formatted += f"OUTBOUND ({outbound['duration']})\n"
-            formatted += f"Airline: {self._get_airline_name(outbound['segments'][0]['carrierCode'])}\n"
-            formatted += f"Stops: {len(outbound['segments']) - 1}\n"
+            append(f"[OPTION {i}] ${price:.2f} {price_status}\n")
             
-            for segment in outbound['segments']:
-                dep_time = segment['departure']['at'].replace('T', ' ').split('+')[0]
-                arr_time = segment['arrival']['at'].replace('T', ' ').split('+')[0]
-                formatted += f"• {segment['departure']['iataCode']} → {segment['arrival']['iataCode']} "
-                formatted += f"({dep_time} → {arr_time})\n"
-            
-            # Format return flight if available
-            if len(option['itineraries']) > 1:
-                return_flight = option['itineraries'][1]
-                formatted += f"RETURN ({return_flight['duration']})\n"
-                formatted += f"Airline: {self._get_airline_name(return_flight['segments'][0]['carrierCode'])}\n"
-                formatted += f"Stops: {len(return_flight['segments']) - 1}\n"
+            for label, itinerary in zip(("OUTBOUND", "RETURN"), option['itineraries'][:2]):
+                segments = itinerary['segments']
+                carrier = segments[0]['carrierCode']
+                append(f"{label} ({itinerary['duration']})\n")
+                append(f"Airline: {airline_lookup(carrier, carrier)}\n")
+                append(f"Stops: {len(segments) - 1}\n")
                 
-                for segment in return_flight['segments']:
-                    dep_time = segment['departure']['at'].replace('T', ' ').split('+')[0]
-                    arr_time = segment['arrival']['at'].replace('T', ' ').split('+')[0]
-                    formatted += f"• {segment['departure']['iataCode']} → {segment['arrival']['iataCode']} "
-                    formatted += f"({dep_time} → {arr_time})\n"
-            
-            formatted += "Price: $" + str(price) + "\n\n"
+                for segment in segments:
+                    dep, arr = segment['departure'], segment['arrival']
+                    # ISO 8601 is fixed-width (YYYY-MM-DDTHH:MM:SS...): two
+                    # slices swap the T for a space and drop the timezone
+                    # suffix without replace/split allocations
+                    dep_at, arr_at = dep['at'], arr['at']
+                    append(_SEGMENT_TMPL.format(
+                        dep=dep['iataCode'], arr=arr['iataCode'],
+                        dt=dep_at[:10] + ' ' + dep_at[11:19],
+                        at=arr_at[:10] + ' ' + arr_at[11:19]))
             
-        return formatted
+            append(f"Price: ${price}\n\n")
+
+        result = ''.join(parts)
+        self._format_cache[cache_key] = result
+        return result
             
     def get_flight_summary(self, travel_plan: TravelPlan) -> str:
         """Return a summary of booked flight information"""
@@ -239,10 +322,6 @@ Dates: {travel_plan.departure_date} to {travel_plan.return_date}
 Option: {travel_plan.flights.get('option')}
 Total Price: ${travel_plan.flights.get('price', 0):.2f}"""
             
-    def _get_airline_name(self, carrier_code: str) -> str:
-        """Get airline name from carrier code"""
-        return self.AIRLINE_NAMES.get(carrier_code, carrier_code)
-        
     def _validate_search_criteria(self, travel_plan: TravelPlan) -> bool:
         """Validate flight search criteria"""
         # Check if we have all required data
@@ -332,12 +411,28 @@ Total Price: ${travel_plan.flights.get('price', 0):.2f}"""
             elif choice == '4':
                 travel_plan.total_budget = get_numeric_input("New total budget (USD): ", min_value=100)
                 travel_plan.remaining_budget = travel_plan.total_budget
+                # A budget change does not alter the query tuple: re-annotate
+                # the cached results locally instead of re-calling Amadeus
+                self._refilter_last_results(travel_plan)
                 break
             elif choice == '5':
                 return
             else:
                 print("Invalid input. Please enter a number between 1 and 5.")
                 
+    def _refilter_last_results(self, travel_plan: TravelPlan) -> None:
+        """Redisplay the last fetched options against the updated budget.
+
+        The affordability annotations are computed locally from the cached
+        response, so no new HTTP request is issued; only a change of
+        origin, destination or dates needs a fresh search.
+        """
+        options = self._last_flight_options
+        if not options or not options.get('data'):
+            return
+        self._format_cache.clear()
+        print(self.format_flight_data(options, travel_plan))
+
     def answer_question(self, question, flight_data):
         """Answer questions about flight options."""
         prompt = f"""As a travel assistant, answer this question about flight options:
@@ -1,19 +1,95 @@
 """
 Hotel service for managing hotel-related operations
 """
-from typing import Dict, Any
+import asyncio
+import json
+import re
+from typing import Dict, Any, Optional
 from datetime import datetime
-from models.travel_plan import TravelPlan
-from langchain_core.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain.memory import ConversationBufferMemory
+from models.travel_plan import HotelBooking, TravelPlan
+from services.llm_cache import CachingLLM, LLMCache, SemanticCache
 from utils.input_utils import get_numeric_input
 
+# Display separator, built once instead of per print
+_SEP60 = '=' * 60
+
+# Compiled once: option headers ("1." / "Option 1:") and field keywords.
+# A single C-level search with lastgroup dispatch replaces the chain of
+# per-line startswith()/lower()/in checks in the parser.
+_HOTEL_OPTION_RE = re.compile(r"^(?:(?P<opt>[1-3])\.|Option\s+(?P<opt2>[1-3]):)")
+_HOTEL_FIELD_RE = re.compile(
+    r"(?P<stars>stars?|⭐)|(?P<location>location|area)|(?P<breakfast>breakfast)|"
+    r"(?P<price>price|\$)|(?P<features>feature|selling)", re.I)
+
+# Estimated price tiers for options 1-3: (budget multiplier, per-night cap)
+_PRICE_TIERS = ((0.4, 200), (0.3, 150), (0.2, 100))
+
+# Output caps: generation time is roughly linear in output tokens, and a
+# 3-option list / single answer never needs an unbounded response
+_MAX_SUGGESTION_TOKENS = 500
+_MAX_ANSWER_TOKENS = 300
+
+# Prompt templates - static instructions first, dynamic values at the end so
+# provider-side prompt caching can reuse the shared prefix
+_SUGGESTION_TEMPLATE = """As a travel assistant, suggest 3 hotel options for the stay described below,
+keeping the total under the traveler's budget. For each option include:
+- Hotel name (make it realistic for the city)
+- Star rating (3-5 stars)
+- Location area
+- Breakfast inclusion
+- Approximate total price (should be under the total budget)
+- Brief selling point
+Format as a numbered list with clear sections.
+
+Destination: {destination}
+Nights: {nights}
+Total budget: ${budget:.2f}"""
+
+# Shares its opening sentence byte-for-byte with _SUGGESTION_TEMPLATE so a
+# provider-side prompt cache covers the common prefix of both variants
+_SUGGESTION_JSON_TEMPLATE = """As a travel assistant, suggest 3 hotel options for the stay described below,
+keeping the total under the traveler's budget.
+
+Return ONLY a JSON array of 3 objects with these keys:
+- "name": hotel name (realistic for the city)
+- "stars": star rating, 3 to 5 (number)
+- "location": neighbourhood or area
+- "breakfast": whether breakfast is included
+- "price": approximate total price for the stay (number)
+- "features": brief selling point
+
+No text outside the JSON array.
+
+Destination: {destination}
+Nights: {nights}
+Total budget: ${budget:.2f}"""
+
+_INQUIRY_TEMPLATE = """You're a helpful hotel booking assistant.
+Please provide a detailed and helpful response about the hotel options specifically addressing the user's question.
+
+Destination: {destination}
+Budget: ${budget:.2f} for {nights} nights
+
+Available hotel options:
+{hotels_info}
+
+The user's question is: {question}"""
+
+
 class HotelService:
     """Service for hotel search and booking"""
     
     def __init__(self, llm: Any):
         self.llm = llm
+        # Cached wrapper: repeat prompts are answered from the cache
+        self.cached_llm = CachingLLM(llm)
+        # Suggestion responses keyed on (destination, budget, nights), so
+        # re-entering the hotel menu with unchanged parameters skips the call
+        self._suggestion_cache: Dict[tuple, str] = {}
+        # Paraphrase-tolerant cache for free-text questions about options
+        self._semantic_cache = SemanticCache()
+        # (booking fields, summary) pair, rebuilt only when the booking changes
+        self._summary_cache: Optional[tuple] = None
         
     def discuss_hotels(self, travel_plan: TravelPlan) -> None:
         """AI-generated hotel suggestions without hardcoded data"""
@@ -22,43 +98,65 @@ class HotelService:
             return
         # Calculate stay duration
         nights = travel_plan.get_trip_duration_days()
-        max_per_night = travel_plan.remaining_budget / nights if nights > 0 else travel_plan.remaining_budget
-        # AI Prompt Template
-        prompt = PromptTemplate(
-            input_variables=["destination", "budget", "nights"],
-            template="""As a travel assistant, suggest 3 hotel options in {destination} for a {nights}-night stay
-            with a total budget of ${budget:.2f}. For each option include:
-            - Hotel name (make it realistic for the city)
-            - Star rating (3-5 stars)
-            - Location area
-            - Breakfast inclusion
-            - Approximate total price (should be under ${budget:.2f})
-            - Brief selling point
-            Format as a numbered list with clear sections."""
-        )
-        # Generate suggestions
-        chain = LLMChain(llm=self.llm, prompt=prompt)
-        response = chain.invoke({
-            "destination": travel_plan.destination['name'],
-            "budget": travel_plan.remaining_budget,
-            "nights": nights
-        })["text"]
-        # Display results
-        print(f"\n{'='*60}\n🏨 RECOMMENDED HOTELS IN {travel_plan.destination['name'].upper()}\n{'='*60}")
-        print(f"💰 Remaining Budget: ${travel_plan.remaining_budget:.2f} | 📅 {nights} nights\n")
-        print(response)
-        
-        # Use a direct prompt template approach instead of chains with memory
-        inquiry_template = """You're a helpful hotel booking assistant for {destination}.
-        The user has a budget of ${budget:.2f} for a {nights}-night stay.
-        
-        Available hotel options:
-        {hotels_info}
-        
-        The user's question is: {question}
-        
-        Please provide a detailed and helpful response about the hotel options specifically addressing the user's question."""
-        
+        response = self._get_or_fetch_suggestions(travel_plan, nights)
+        self._booking_loop(travel_plan, response, nights)
+
+    def _get_or_fetch_suggestions(self, travel_plan: TravelPlan, nights: int) -> str:
+        """Display and return the suggestion text, generating it on a cache miss"""
+        # Bind once: both values are read several times below
+        dest_name = travel_plan.destination['name']
+        budget = travel_plan.remaining_budget
+        max_per_night = budget / nights if nights > 0 else budget
+        # Generate suggestions (cached for identical search parameters)
+        cache_key = (dest_name, round(budget, 2), nights)
+        response = self._suggestion_cache.get(cache_key)
+        # Display the header up front so streamed tokens appear under it
+        print(f"\n{_SEP60}\n🏨 RECOMMENDED HOTELS IN {dest_name.upper()}\n{_SEP60}")
+        print(f"💰 Remaining Budget: ${budget:.2f} | 📅 {nights} nights\n")
+        if response is None:
+            prompt_text = _SUGGESTION_TEMPLATE.format(
+                destination=dest_name, budget=budget, nights=nights)
+            # Generate a lower price tier alongside the main set: both calls
+            # run concurrently, so the alternative is effectively free and
+            # lands in the cache ready for a tighter-budget revisit
+            budget_tier = round(budget * 0.6, 2)
+            budget_prompt = _SUGGESTION_TEMPLATE.format(
+                destination=dest_name, budget=budget_tier, nights=nights)
+            try:
+                response, budget_response = asyncio.run(
+                    self._astream_suggestion_tiers(prompt_text, budget_prompt))
+                self._suggestion_cache[(dest_name, budget_tier, nights)] = budget_response
+            except Exception:
+                # LLM without async/streaming support, or a loop already running
+                response = str(self.llm.invoke(prompt_text, max_tokens=_MAX_SUGGESTION_TOKENS))
+                print(response)
+            self._suggestion_cache[cache_key] = response
+        else:
+            print(response)
+        return response
+
+    def _booking_loop(self, travel_plan: TravelPlan, response: str, nights: int) -> None:
+        """Run the selection/question loop over an already displayed option list"""
+        # Bind once; remaining_budget only changes when a booking succeeds,
+        # at which point this method returns
+        dest_name = travel_plan.destination['name']
+        budget = travel_plan.remaining_budget
+        # Estimated prices per option (premium/mid-range/budget), computed
+        # once per session instead of on every selection in the loop
+        estimated_prices = [min(budget * mult, cap * nights)
+                            for mult, cap in _PRICE_TIERS]
+
+        # The options block is invariant across questions: format it once so
+        # every inquiry prompt shares a byte-identical prefix and only the
+        # question varies at the tail - provider-side prompt caching then
+        # skips re-prefilling the options on follow-up questions
+        inquiry_prefix = _INQUIRY_TEMPLATE.format(
+            destination=dest_name,
+            budget=budget,
+            nights=nights,
+            hotels_info=response,
+            question='')
+
         # Booking interaction
         while True:
             choice = input("\nChoose an option (1-3) or [X] to skip, or ask a question about the options: ").strip().upper()
@@ -69,77 +167,107 @@ class HotelService:
             if choice in ('1', '2', '3'):
                 # Extract hotel info from the response to avoid asking user for redundant information
                 option_num = int(choice)
-                
-                # Parse response to get price - simplified approach using estimated prices
-                estimated_prices = {
-                    1: min(travel_plan.remaining_budget * 0.4, 200 * nights),  # Option 1 - premium 
-                    2: min(travel_plan.remaining_budget * 0.3, 150 * nights),  # Option 2 - mid-range
-                    3: min(travel_plan.remaining_budget * 0.2, 100 * nights)   # Option 3 - budget
-                }
-                price = estimated_prices[option_num]
+                price = estimated_prices[option_num - 1]
                 
                 # Confirm booking with extracted information
                 print(f"\nHotel Option {choice} - Estimated price: ${price:.2f} for {nights} nights")
                 confirm = input("Confirm booking? (y/n): ").lower()
                 
                 if confirm == 'y':
-                    if price <= travel_plan.remaining_budget:
-                        travel_plan.hotels = {
-                            'option': option_num,
-                            'price': price,
-                            'nights': nights,
-                            'destination': travel_plan.destination['name']
-                        }
+                    if price <= budget:
+                        travel_plan.hotels = HotelBooking(
+                            option=option_num,
+                            price=price,
+                            nights=nights,
+                            destination=dest_name
+                        )
                         travel_plan.remaining_budget -= price
                         print(f"✅ Hotel choice {choice} booked! Remaining budget: ${travel_plan.remaining_budget:.2f}")
                         return
                     else:
-                        print(f"⚠️ Price ${price:.2f} exceeds your remaining budget of ${travel_plan.remaining_budget:.2f}!")
+                        print(f"⚠️ Price ${price:.2f} exceeds your remaining budget of ${budget:.2f}!")
                 else:
                     print("Booking cancelled. You can select another option.")
             else:
-                # Use direct prompt instead of chain with memory
-                filled_prompt = inquiry_template.format(
-                    destination=travel_plan.destination['name'],
-                    budget=travel_plan.remaining_budget,
-                    nights=nights,
-                    hotels_info=response,
-                    question=choice
-                )
-                # Call the LLM directly with correct output handling
-                response = str(self.llm.invoke(filled_prompt))
-                print(f"\nAssistant: {response}")
+                # Shared prefix plus the question; the original options stay
+                # the context for every follow-up instead of the last answer
+                filled_prompt = inquiry_prefix + choice
+                # Stream the answer so reading starts at the first token
+                print("\nAssistant: ", end='', flush=True)
+                try:
+                    for chunk in self.llm.stream(filled_prompt, max_tokens=_MAX_ANSWER_TOKENS):
+                        print(str(getattr(chunk, 'content', chunk)), end='', flush=True)
+                    print()
+                except (AttributeError, NotImplementedError):
+                    print(str(self.llm.invoke(filled_prompt, max_tokens=_MAX_ANSWER_TOKENS)))
     
+    async def _astream_suggestion_tiers(self, prompt_text: str, budget_prompt: str):
+        """Stream the main suggestions while the reduced-budget tier generates.
+
+        Tokens are printed as they arrive, so the user starts reading at
+        first-token latency instead of waiting for the full response.
+        """
+        budget_task = asyncio.create_task(
+            self.llm.ainvoke(budget_prompt, max_tokens=_MAX_SUGGESTION_TOKENS))
+        buf = []
+        async for chunk in self.llm.astream(prompt_text, max_tokens=_MAX_SUGGESTION_TOKENS):
+            text = str(getattr(chunk, 'content', chunk))
+            print(text, end='', flush=True)
+            buf.append(text)
+        print()
+        return ''.join(buf), str(await budget_task)
+
     def get_hotel_summary(self, travel_plan: TravelPlan) -> str:
         """Return a summary of booked hotel information"""
         if not travel_plan.hotels:
             return "No hotel booked yet."
             
-        return f"""🏨 HOTEL BOOKING SUMMARY
-Destination: {travel_plan.hotels.get('destination', travel_plan.destination['name'])}
-Option: {travel_plan.hotels.get('option')}
-Nights: {travel_plan.hotels.get('nights')}
-Total Price: ${travel_plan.hotels.get('price', 0):.2f}"""
+        hotels = travel_plan.hotels
+        # Keyed on the field values: modify_hotel_booking mutates the record
+        # in place, so identity alone would serve stale text
+        key = (hotels.option, hotels.price, hotels.nights,
+               hotels.destination or travel_plan.destination['name'])
+        if self._summary_cache is None or self._summary_cache[0] != key:
+            self._summary_cache = (key, f"""🏨 HOTEL BOOKING SUMMARY
+Destination: {key[3]}
+Option: {hotels.option}
+Nights: {hotels.nights}
+Total Price: ${hotels.price:.2f}""")
+        return self._summary_cache[1]
     
     def get_hotel_suggestions(self, destination, budget, nights):
         """Get hotel suggestions and return data instead of printing."""
         max_per_night = budget / nights if nights > 0 else budget
         
-        # Generate suggestions using the LLM
-        prompt = f"""As a travel assistant, suggest 3 hotel options in {destination} for a {nights}-night stay
-        with a total budget of ${budget:.2f}. For each option include:
-        - Hotel name (make it realistic for the city)
-        - Star rating (3-5 stars)
-        - Location area
-        - Breakfast inclusion
-        - Approximate total price (should be under ${budget:.2f})
-        - Brief selling point
-        
-        Format as a structured list with clear sections."""
-        
-        response = self.llm.invoke(prompt)
-        
-        # Parse the response into a structured format
+        # Ask for JSON so the response decodes directly instead of going
+        # through the line parser (shared static-prefix layout)
+        prompt = _SUGGESTION_JSON_TEMPLATE.format(destination=destination,
+                                                  budget=budget, nights=nights)
+
+        cache_key = ('json', destination, round(budget, 2), nights)
+        response = self._suggestion_cache.get(cache_key)
+        if response is None:
+            response = self.llm.invoke(prompt, max_tokens=_MAX_SUGGESTION_TOKENS)
+            self._suggestion_cache[cache_key] = response
+
+        text = str(response)
+        try:
+            items = json.loads(text[text.index('['):text.rindex(']') + 1])
+            hotel_options = [{
+                'option': i,
+                'name': str(item.get('name', f'Hotel {i}')),
+                'stars': str(item.get('stars', '')),
+                'location': str(item.get('location', '')),
+                'breakfast': str(item.get('breakfast', '')),
+                'price': float(item.get('price', budget * (1.0 - 0.1 * i))),
+                'features': str(item.get('features', '')),
+            } for i, item in enumerate(items[:3], 1)]
+            if hotel_options:
+                return hotel_options
+        except (ValueError, TypeError, AttributeError):
+            pass
+
+        # Fall back to line-by-line parsing for free-text responses
         hotel_options = []
         current_option = {}
         
@@ -147,37 +275,35 @@ Total Price: ${travel_plan.hotels.get('price', 0):.2f}"""
             line = line.strip()
             if not line:
                 continue
-            
-            if line.startswith('1.') or line.startswith('Option 1:'):
-                current_option = {'option': 1}
-                hotel_options.append(current_option)
-            elif line.startswith('2.') or line.startswith('Option 2:'):
-                current_option = {'option': 2}
-                hotel_options.append(current_option)
-            elif line.startswith('3.') or line.startswith('Option 3:'):
-                current_option = {'option': 3}
+
+            header = _HOTEL_OPTION_RE.match(line)
+            if header:
+                current_option = {'option': int(header.group('opt') or header.group('opt2'))}
                 hotel_options.append(current_option)
-            
+
             # Parse hotel details
-            if 'option' in current_option:
-                if 'name' not in current_option and ':' not in line and len(line) > 5:
-                    current_option['name'] = line
-                elif 'star' in line.lower() or '⭐' in line:
-                    current_option['stars'] = line
-                elif 'location' in line.lower() or 'area' in line.lower():
-                    current_option['location'] = line.split(':')[-1].strip()
-                elif 'breakfast' in line.lower():
-                    current_option['breakfast'] = line.split(':')[-1].strip()
-                elif 'price' in line.lower() or '$' in line:
-                    try:
-                        price_text = line.split('$')[1].split()[0].replace(',', '')
-                        current_option['price'] = float(price_text)
-                    except:
-                        # Estimate a price if parsing fails
-                        current_option['price'] = budget * (0.7 if current_option['option'] == 3 else 
-                                                          0.8 if current_option['option'] == 2 else 0.9)
-                elif 'feature' in line.lower() or 'selling' in line.lower() or ':' in line:
-                    current_option['features'] = line.split(':')[-1].strip()
+            if 'option' not in current_option:
+                continue
+            if 'name' not in current_option and ':' not in line and len(line) > 5:
+                current_option['name'] = line
+                continue
+
+            field = _HOTEL_FIELD_RE.search(line)
+            kind = field.lastgroup if field else None
+            if kind == 'stars':
+                current_option['stars'] = line
+            elif kind == 'price':
+                try:
+                    price_text = line.split('$')[1].split()[0].replace(',', '')
+                    current_option['price'] = float(price_text)
+                except:
+                    # Estimate a price if parsing fails
+                    current_option['price'] = budget * (0.7 if current_option['option'] == 3 else 
+                                                      0.8 if current_option['option'] == 2 else 0.9)
+            elif kind is not None or ':' in line:
+                # location/breakfast/features all keep the text after the
+                # colon; unrecognized "key: value" lines land in features
+                current_option[kind or 'features'] = line.split(':')[-1].strip()
         
         return hotel_options
     
@@ -191,9 +317,17 @@ Total Price: ${travel_plan.hotels.get('price', 0):.2f}"""
         Question: {question}
         
         Provide a helpful, detailed response about the hotels."""
-        
-        response = self.llm.invoke(prompt)
-        return str(response)
+
+        # Paraphrased repeats of the same question hit the semantic cache;
+        # verbatim repeats still hit the exact prompt-hash cache below
+        context_key = LLMCache.make_key(str(hotel_data))
+        cached = self._semantic_cache.get(context_key, question)
+        if cached is not None:
+            return cached
+
+        response = str(self.cached_llm.invoke(prompt, max_tokens=_MAX_ANSWER_TOKENS))
+        self._semantic_cache.set(context_key, question, response)
+        return response
 
     def modify_hotel_booking(self, travel_plan: TravelPlan) -> None:
         """Allow user to modify existing hotel booking"""
@@ -213,13 +347,18 @@ Total Price: ${travel_plan.hotels.get('price', 0):.2f}"""
         
         if choice == '1':
             # Refund the previous booking cost
-            travel_plan.remaining_budget += travel_plan.hotels.get('price', 0)
+            travel_plan.remaining_budget += travel_plan.hotels.price
             travel_plan.hotels = None
             print(f"✅ Booking cancelled. Remaining budget: ${travel_plan.remaining_budget:.2f}")
-            self.discuss_hotels(travel_plan)
+            # The refund restores the pre-booking budget, so the suggestion
+            # cache from the original search usually hits and the booking
+            # loop restarts without another LLM call
+            nights = travel_plan.get_trip_duration_days()
+            suggestions = self._get_or_fetch_suggestions(travel_plan, nights)
+            self._booking_loop(travel_plan, suggestions, nights)
         elif choice == '2':
-            current_nights = travel_plan.hotels.get('nights', 0)
-            current_price = travel_plan.hotels.get('price', 0)
+            current_nights = travel_plan.hotels.nights
+            current_price = travel_plan.hotels.price
             price_per_night = current_price / current_nights if current_nights > 0 else 0
             
             print(f"Current stay: {current_nights} nights at ${price_per_night:.2f}/night")
@@ -238,8 +377,8 @@ Total Price: ${travel_plan.hotels.get('price', 0):.2f}"""
                 
             # Update the booking
             travel_plan.remaining_budget -= price_difference
-            travel_plan.hotels['nights'] = new_nights
-            travel_plan.hotels['price'] = new_price
+            travel_plan.hotels.nights = new_nights
+            travel_plan.hotels.price = new_price
             
             print(f"✅ Booking updated to {new_nights} nights. New price: ${new_price:.2f}")
             print(f"Remaining budget: ${travel_plan.remaining_budget:.2f}")
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+Caching layer for LLM calls
+"""
+import difflib
+import hashlib
+import string
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from config import get_app_config
+
+# rapidfuzz scores paraphrases far faster than difflib; optional, as in
+# services.api_service
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+# Token scorers only work on clean tokens: questions are casefolded and
+# stripped of punctuation before comparison
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+
+def bucket_budget(budget: float, step: int = 50) -> float:
+    """Round a budget to the nearest bucket so near-identical queries share a cache entry"""
+    if not budget:
+        return 0.0
+    return round(budget / step) * step
+
+
+class LLMCache:
+    """TTL cache for LLM responses keyed by prompt hash.
+
+    Uses an in-memory dict by default; a different backend (e.g. Redis or
+    SQLite) can be passed in as long as it supports get/set by string key.
+    """
+
+    def __init__(self, ttl: Optional[int] = None, backend: Optional[Dict] = None):
+        self.ttl = ttl if ttl is not None else get_app_config()['cache_expiry']
+        self._store = backend if backend is not None else {}
+
+    @staticmethod
+    def make_key(prompt: str) -> str:
+        """Deterministic key for a fully rendered prompt"""
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached response for key, or None if missing/expired"""
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        expiry, value = entry
+        if time.time() > expiry:
+            del self._store[key]
+            return None
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a response with the configured TTL"""
+        self._store[key] = (time.time() + self.ttl, value)
+
+
+class SemanticCache:
+    """Paraphrase-tolerant cache for free-text questions.
+
+    Exact-match caching misses rewordings like "Does option 1 have
+    breakfast?" vs "Is breakfast included with option 1?". Entries are
+    bucketed by a context key (e.g. the options text shown to the user),
+    questions are normalized (casefold, punctuation stripped) and matched
+    on token-set similarity - rapidfuzz when installed, a difflib
+    approximation of the same scorer otherwise - so paraphrased repeats
+    skip the LLM call. The 0.75 default threshold is calibrated to that
+    pair: both scorers put it just below 0.8, while unrelated questions
+    share too few tokens to come close.
+    """
+
+    def __init__(self, threshold: float = 0.75, maxsize: int = 256):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # (context_key, question) -> response
+
+    @staticmethod
+    def _normalize(question: str) -> str:
+        """Canonical comparison form: casefolded, no punctuation"""
+        return ' '.join(question.casefold().translate(_PUNCT_TABLE).split())
+
+    @staticmethod
+    def _similarity(a: str, b: str) -> float:
+        if fuzz is not None:
+            return fuzz.token_set_ratio(a, b) / 100.0
+        # difflib approximation of token_set_ratio: score the shared
+        # tokens against each full sorted-token string and keep the best,
+        # so reordered words and added filler cost little
+        tokens_a, tokens_b = set(a.split()), set(b.split())
+        common = tokens_a & tokens_b
+        if not common:
+            return 0.0
+        matcher = difflib.SequenceMatcher(None)
+        matcher.set_seq2(' '.join(sorted(common)))
+        best = 0.0
+        for tokens in (tokens_a, tokens_b):
+            matcher.set_seq1(' '.join(sorted(tokens)))
+            best = max(best, matcher.ratio())
+        return best
+
+    def get(self, context_key: str, question: str) -> Optional[str]:
+        """Return the response for the closest cached paraphrase, or None"""
+        norm = self._normalize(question)
+        best_key, best_score = None, 0.0
+        for (ctx, cached_q) in self._entries:
+            if ctx != context_key:
+                continue
+            if cached_q == norm:
+                best_key, best_score = (ctx, cached_q), 1.0
+                break
+            score = self._similarity(norm, cached_q)
+            if score > best_score:
+                best_key, best_score = (ctx, cached_q), score
+        if best_key is not None and best_score >= self.threshold:
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key]
+        return None
+
+    def set(self, context_key: str, question: str, response: str) -> None:
+        """Store a response, evicting the least recently used entry if full"""
+        self._entries[(context_key, self._normalize(question))] = response
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class CachingLLM:
+    """Wraps an LLM client so repeat prompts skip the network round trip"""
+
+    def __init__(self, llm: Any, cache: Optional[LLMCache] = None):
+        self.llm = llm
+        self.cache = cache or LLMCache()
+
+    def invoke(self, prompt: Any, **kwargs: Any) -> Any:
+        key = LLMCache.make_key(str(prompt))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        response = self.llm.invoke(prompt, **kwargs)
+        self.cache.set(key, response)
+        return response
@@ -1,11 +1,12 @@
 import os
+import sys
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Print the environment variables
-print("OPENAI_API_KEY:", os.environ.get("OPENAI_API_KEY", "Not found"))
-print("GOOGLE_MAPS_API_KEY:", os.environ.get("GOOGLE_MAPS_API_KEY", "Not found"))
-print("AMADEUS_CLIENT_ID:", os.environ.get("AMADEUS_CLIENT_ID", "Not found"))
-print("AMADEUS_CLIENT_SECRET:", os.environ.get("AMADEUS_CLIENT_SECRET", "Not found"))
\ No newline at end of file
+# Print the environment variables in a single write
+_KEYS = ("OPENAI_API_KEY", "GOOGLE_MAPS_API_KEY",
+         "AMADEUS_CLIENT_ID", "AMADEUS_CLIENT_SECRET")
+sys.stdout.write('\n'.join(f"{key}: {os.environ.get(key, 'Not found')}"
+                           for key in _KEYS) + '\n')
@@ -3,10 +3,45 @@ Utility functions for date validation, manipulation and formatting
 used throughout the travel planner application.
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import calendar
 import re
 
+# Compiled once at import; validate_date_format runs in every other date
+# helper, so skipping re's cache lookup per call adds up
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Fixed English names, indexed directly instead of routing through the
+# locale-aware strftime machinery
+_WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday',
+             'Friday', 'Saturday', 'Sunday')
+_MONTHS = ('January', 'February', 'March', 'April', 'May', 'June',
+           'July', 'August', 'September', 'October', 'November', 'December')
+
+# Peak travel months: northern-hemisphere summer plus the winter holidays
+_HIGH_SEASON_MONTHS = frozenset({6, 7, 8, 12})
+
+def _parse(date_str):
+    """
+    Validate and parse a YYYY-MM-DD string in a single pass.
+    
+    date.fromisoformat is a C fast path, but since Python 3.11 it accepts
+    more shapes than this app's strict YYYY-MM-DD, so the regex keeps the
+    validation behavior unchanged.
+    
+    Args:
+        date_str (str): Date string in YYYY-MM-DD format
+        
+    Returns:
+        date: Parsed date object
+        
+    Raises:
+        ValueError: If the string is not a valid YYYY-MM-DD date
+    """
+    if not _DATE_RE.match(date_str):
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+    return date.fromisoformat(date_str)
+
 def validate_date_format(date_str):
     """
     Validates if the provided string is in the correct date format (YYYY-MM-DD).
@@ -17,31 +52,27 @@ def validate_date_format(date_str):
     Returns:
         bool: True if valid, False otherwise
     """
-    pattern = r'^\d{4}-\d{2}-\d{2}$'
-    if not re.match(pattern, date_str):
-        return False
-    
     try:
-        datetime.strptime(date_str, '%Y-%m-%d')
+        _parse(date_str)
         return True
     except ValueError:
         return False
 
-def is_future_date(date_str):
+def is_future_date(date_str, today=None):
     """
     Checks if the provided date is in the future.
     
     Args:
         date_str (str): Date string in YYYY-MM-DD format
+        today (date, optional): Reference date; callers validating in a
+            loop can read the clock once and pass it down
         
     Returns:
         bool: True if date is in the future, False otherwise
     """
-    if not validate_date_format(date_str):
-        raise ValueError("Invalid date format. Use YYYY-MM-DD")
-    
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-    today = datetime.now().date()
+    date_obj = _parse(date_str)
+    if today is None:
+        today = datetime.now().date()
     
     return date_obj > today
 
@@ -56,11 +87,8 @@ def calculate_trip_duration(start_date, end_date):
     Returns:
         int: Number of days for the trip
     """
-    if not (validate_date_format(start_date) and validate_date_format(end_date)):
-        raise ValueError("Invalid date format. Use YYYY-MM-DD")
-    
-    start = datetime.strptime(start_date, '%Y-%m-%d').date()
-    end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    start = _parse(start_date)
+    end = _parse(end_date)
     
     if end < start:
         raise ValueError("End date cannot be before start date")
@@ -68,7 +96,7 @@ def calculate_trip_duration(start_date, end_date):
     duration = (end - start).days + 1  # Include both start and end days
     return duration
 
-def is_valid_date_range(start_date, end_date, max_days=30):
+def is_valid_date_range(start_date, end_date, max_days=30, today=None):
     """
     Validates if the date range is valid and within allowed limits.
     
@@ -76,20 +104,19 @@ def is_valid_date_range(start_date, end_date, max_days=30):
         start_date (str): Start date in YYYY-MM-DD format
         end_date (str): End date in YYYY-MM-DD format
         max_days (int): Maximum allowed duration in days
+        today (date, optional): Reference date; callers validating in a
+            loop can read the clock once and pass it down
         
     Returns:
         bool: True if valid, False otherwise
     """
     try:
-        if not (validate_date_format(start_date) and validate_date_format(end_date)):
-            return False
+        start = _parse(start_date)
+        end = _parse(end_date)
         
-        if not is_future_date(start_date):
+        if start <= (today or datetime.now().date()):
             return False
         
-        start = datetime.strptime(start_date, '%Y-%m-%d').date()
-        end = datetime.strptime(end_date, '%Y-%m-%d').date()
-        
         if end < start:
             return False
         
@@ -112,10 +139,10 @@ def format_date_display(date_str, format_str='%B %d, %Y'):
     Returns:
         str: Formatted date string
     """
-    if not validate_date_format(date_str):
-        raise ValueError("Invalid date format. Use YYYY-MM-DD")
-    
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+    date_obj = _parse(date_str)
+    if format_str == '%B %d, %Y':
+        # Fast path for the default format via the name tables
+        return f"{_MONTHS[date_obj.month - 1]} {date_obj.day:02d}, {date_obj.year}"
     return date_obj.strftime(format_str)
 
 def get_day_of_week(date_str):
@@ -128,11 +155,7 @@ def get_day_of_week(date_str):
     Returns:
         str: Day of week (e.g., "Monday")
     """
-    if not validate_date_format(date_str):
-        raise ValueError("Invalid date format. Use YYYY-MM-DD")
-    
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-    return date_obj.strftime('%A')
+    return _WEEKDAYS[_parse(date_str).weekday()]
 
 def add_days(date_str, days):
     """
@@ -145,10 +168,7 @@ def add_days(date_str, days):
     Returns:
         str: Resulting date in YYYY-MM-DD format
     """
-    if not validate_date_format(date_str):
-        raise ValueError("Invalid date format. Use YYYY-MM-DD")
-    
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+    date_obj = _parse(date_str)
     new_date = date_obj + timedelta(days=days)
     return new_date.strftime('%Y-%m-%d')
 
@@ -163,23 +183,17 @@ def get_date_range_list(start_date, end_date):
     Returns:
         list: List of date strings in YYYY-MM-DD format
     """
-    if not (validate_date_format(start_date) and validate_date_format(end_date)):
-        raise ValueError("Invalid date format. Use YYYY-MM-DD")
-    
-    start = datetime.strptime(start_date, '%Y-%m-%d').date()
-    end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    start = _parse(start_date)
+    end = _parse(end_date)
     
     if end < start:
         raise ValueError("End date cannot be before start date")
     
-    date_list = []
-    current = start
-    
-    while current <= end:
-        date_list.append(current.strftime('%Y-%m-%d'))
-        current += timedelta(days=1)
-    
-    return date_list
+    # Ordinal arithmetic plus isoformat skips both the per-day timedelta
+    # objects and the strftime format interpreter
+    first = start.toordinal()
+    return [date.fromordinal(first + i).isoformat()
+            for i in range(end.toordinal() - first + 1)]
 
 def is_high_season(date_str, location=None):
     """
@@ -194,17 +208,6 @@ def is_high_season(date_str, location=None):
     Returns:
         bool: True if likely high season, False otherwise
     """
-    if not validate_date_format(date_str):
-        raise ValueError("Invalid date format. Use YYYY-MM-DD")
-    
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-    month = date_obj.month
-    
-    # Simple default high season logic (northern hemisphere summer, winter holidays)
-    if month in [6, 7, 8, 12]:
-        return True
-    
     # If location specific logic is added, it would go here
     # For example, beach destinations vs ski resorts
-    
-    return False
\ No newline at end of file
+    return _parse(date_str).month in _HIGH_SEASON_MONTHS
\ No newline at end of file
@@ -26,17 +26,19 @@ def get_numeric_input(prompt: str, min_value: float = 0,
             if not value:
                 print("This field is required. Please try again.")
                 continue
-            
-            num = float(value)
-            if not allow_float and num != int(num):
-                print("Please enter a whole number.")
-                continue
-                
+
+            if allow_float:
+                num = float(value)
+            else:
+                # Integer prompts parse with int() directly: faster than a
+                # float round-trip and the range check stays int-int
+                num = int(value)
+
             if num < min_value or num > max_value:
                 print(f"Please enter a value between {min_value} and {max_value}.")
                 continue
-                
-            return int(num) if not allow_float else num
+
+            return num
         except ValueError:
             print("Please enter a valid number.")
 
@@ -107,15 +109,19 @@ def get_choice_input(prompt: str, options: list, allow_other: bool = False) -> s
     Returns:
         User's selected option
     """
+    # Build the prompt and error strings once; the retry loop only reads them
     options_display = ", ".join(options)
+    full_prompt = f"{prompt} [{options_display}]: "
+    err_msg = f"Please select one of: {options_display}"
+    opts_set = frozenset(options)
     while True:
-        choice = input(f"{prompt} [{options_display}]: ").strip()
-        
-        if choice in options:
+        choice = input(full_prompt).strip()
+
+        if choice in opts_set:
             return choice
         elif allow_other:
             confirm = input(f"'{choice}' is not in the suggested options. Use anyway? (y/n): ").lower()
             if confirm == 'y':
                 return choice
         else:
-            print(f"Please select one of: {options_display}")
\ No newline at end of file
+            print(err_msg)
\ No newline at end of file
@@ -4,9 +4,87 @@ used throughout the travel planner application.
 """
 
 import re
-from difflib import get_close_matches
+import heapq
+import math
+import sys
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from bisect import bisect_left
+from operator import itemgetter
+from difflib import SequenceMatcher
 import json
 import os
+import pickle
+
+# orjson decodes large location datasets several times faster than the
+# stdlib parser; fall back to json when it is not installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# rapidfuzz scores fuzzy matches in C and is far faster than difflib;
+# without it the substring checks plus difflib remain the fallback
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+
+@dataclass(slots=True, frozen=True)
+class City:
+    """City record.
+
+    Frozen slots dataclass: compact fixed layout instead of a per-entry
+    dict, with subscription kept for dict-style consumers. Coordinates
+    are optional; the bundled sample data does not carry them.
+    """
+    name: str
+    country: str
+    population: int
+    lat: float = None
+    lon: float = None
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+
+@dataclass(slots=True, frozen=True)
+class Airport:
+    """Airport record; same shape rationale as City."""
+    name: str
+    city: str
+    iata: str
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+
+@dataclass(slots=True, frozen=True)
+class Country:
+    """Country record; same shape rationale as City."""
+    name: str
+    code: str
+    continent: str
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+
+# Known input fields per record type; extra keys in data files are dropped
+_CITY_FIELDS = ('name', 'country', 'population', 'lat', 'lon')
+_AIRPORT_FIELDS = ('name', 'city', 'iata')
+_COUNTRY_FIELDS = ('name', 'code', 'continent')
+
 
 # Sample data structures for storing location information
 # In a production app, this would likely be replaced with a database or API
@@ -23,20 +101,109 @@ class LocationData:
         self._countries = {}
         
         if data_file and os.path.exists(data_file):
-            self._load_from_file(data_file)
+            if not self._load_from_cache(data_file):
+                self._load_from_file(data_file)
+                self._convert_tables()
+                self._write_cache(data_file)
         else:
             # Default minimal dataset if no file is provided
             self._init_default_data()
-    
+            self._convert_tables()
+    
+    def _convert_tables(self):
+        """Convert raw per-entry dicts into frozen slots records."""
+        # City keys are interned so _norm'd lookups compare by pointer
+        self._cities = {sys.intern(k): City(**{f: v[f] for f in _CITY_FIELDS if f in v})
+                        for k, v in self._cities.items()}
+        self._airports = {k: Airport(**{f: v[f] for f in _AIRPORT_FIELDS if f in v})
+                          for k, v in self._airports.items()}
+        self._countries = {k: Country(**{f: v[f] for f in _COUNTRY_FIELDS if f in v})
+                           for k, v in self._countries.items()}
+    
+    def _load_from_cache(self, data_file):
+        """Load the tables and indexes from a binary sidecar, if fresh.
+        
+        Warm starts skip JSON tokenization entirely: a pickle of the
+        parsed tables plus derived indexes loads in one pass. The cache
+        is only trusted while it is newer than the JSON it came from.
+        """
+        cache_file = data_file + '.cache.pkl'
+        try:
+            if os.path.getmtime(cache_file) <= os.path.getmtime(data_file):
+                return False
+            with open(cache_file, 'rb') as f:
+                state = pickle.load(f)
+            self._cities, self._airports, self._countries = state
+            return True
+        except (OSError, pickle.UnpicklingError, ValueError):
+            return False
+    
+    def _write_cache(self, data_file):
+        """Write the binary sidecar next to the JSON; best effort."""
+        try:
+            with open(data_file + '.cache.pkl', 'wb') as f:
+                pickle.dump((self._cities, self._airports, self._countries),
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass
+    
+    # Derived indexes are cached properties: each is built on first use
+    # and only if a code path actually needs it, so startup pays for the
+    # base tables alone.
+
+    @cached_property
+    def _airports_by_city(self):
+        """Reverse index so airport-by-city lookups are one dict probe."""
+        index = {}
+        for airport in self._airports.values():
+            index.setdefault(airport['city'], []).append(airport)
+        return index
+
+    @cached_property
+    def _city_keys_sorted(self):
+        """Sorted city keys so prefix searches bisect to their range."""
+        return sorted(self._cities)
+
+    @cached_property
+    def _popular(self):
+        """Top five city names by population (populations are static)."""
+        return [c['name'] for c in heapq.nlargest(
+            5, self._cities.values(), key=itemgetter('population'))]
+
+    @cached_property
+    def _prefix(self):
+        """Two-character prefix buckets for the typeahead.
+
+        Each entry pairs a lowercased match key with its display string,
+        cities first so suggestion ordering matches the old full scan.
+        """
+        index = {}
+        for key, city in self._cities.items():
+            index.setdefault(key[:2], []).append((key, city['name']))
+        for code, airport in self._airports.items():
+            display = f"{airport['name']} ({code})"
+            name_key = airport['name'].lower()
+            index.setdefault(name_key[:2], []).append((name_key, display))
+            code_key = code.lower()
+            index.setdefault(code_key[:2], []).append((code_key, display))
+        return index
+
+    @cached_property
+    def _airport_name_lower(self):
+        """Lowercased airport names for substring search."""
+        return {code: airport['name'].lower()
+                for code, airport in self._airports.items()}
+
     def _load_from_file(self, data_file):
         """Load location data from a JSON file."""
         try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self._cities = data.get('cities', {})
-                self._airports = data.get('airports', {})
-                self._countries = data.get('countries', {})
-        except (json.JSONDecodeError, IOError) as e:
+            # Binary read: the decoder works on the raw bytes directly
+            with open(data_file, 'rb') as f:
+                data = _loads(f.read())
+            self._cities = data.get('cities', {})
+            self._airports = data.get('airports', {})
+            self._countries = data.get('countries', {})
+        except (ValueError, IOError) as e:
             print(f"Error loading location data: {e}")
             self._init_default_data()
     
@@ -87,32 +254,103 @@ class LocationData:
     def get_airports_by_city(self, city_name):
         """Get all airports for a given city."""
         key = city_name.lower().strip()
-        return [airport for code, airport in self._airports.items() if airport['city'] == key]
+        return self._airports_by_city.get(key, [])
     
     def search_cities(self, query):
         """Search for cities by name prefix."""
         query = query.lower().strip()
-        return {k: v for k, v in self._cities.items() if k.startswith(query)}
+        if not query:
+            return dict(self._cities)
+        # All keys with this prefix sort contiguously: bisect to the start
+        # of the range and walk until the prefix no longer matches
+        keys = self._city_keys_sorted
+        lo = bisect_left(keys, query)
+        results = {}
+        for key in keys[lo:]:
+            if not key.startswith(query):
+                break
+            results[key] = self._cities[key]
+        return results
     
-    def search_airports(self, query):
-        """Search for airports by name or code."""
+    def iter_airport_matches(self, query):
+        """Yield (code, airport) matches for a name or code query.
+        
+        Generator form so callers that only need the first hit stop the
+        scan early instead of paying for a full results dict.
+        """
         query = query.strip()
-        results = {}
         
         # Search by IATA code
-        if query.upper() in self._airports:
-            results[query.upper()] = self._airports[query.upper()]
+        code = query.upper()
+        exact = self._airports.get(code)
+        if exact is not None:
+            yield code, exact
         
-        # Search by name
+        # Search by name via the precomputed lowercase cache
         query_lower = query.lower()
-        for code, airport in self._airports.items():
-            if query_lower in airport['name'].lower():
-                results[code] = airport
-        
-        return results
+        name_lower = self._airport_name_lower
+        for other, airport in self._airports.items():
+            if other != code and query_lower in name_lower[other]:
+                yield other, airport
+    
+    def search_airports(self, query):
+        """Search for airports by name or code."""
+        return dict(self.iter_airport_matches(query))
+
+def _norm(s):
+    """
+    Canonical lookup key for a location name.
+    
+    One strip+lower pass, then sys.intern so repeated lookups of the
+    same name hit the dict's pointer-equality shortcut before hashing.
+    """
+    return sys.intern(s.strip().lower())
+
+@lru_cache(maxsize=1)
+def get_location_data():
+    """
+    Lazily constructed shared LocationData instance.
+    
+    Importing this module no longer loads the dataset; the first call
+    (or the first access to the legacy location_data attribute, via the
+    module __getattr__ below) pays for it.
+    """
+    return LocationData(os.environ.get('FINDTRAVEL_LOCATION_DATA'))
 
-# Initialize global location data
-location_data = LocationData()
+def __getattr__(name):
+    # PEP 562 hook keeping the old module-level location_data working
+    if name == 'location_data':
+        return get_location_data()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _best_close_match(word, possibilities, cutoff=0.8):
+    """
+    Best fuzzy candidate for word, like difflib.get_close_matches(n=1).
+    
+    Unlike the stdlib helper this computes each ratio once, caches it in
+    a local, and reuses one SequenceMatcher, keeping only the cheap
+    upper-bound prefilters from difflib.
+    
+    Args:
+        word (str): String to match
+        possibilities (iterable): Candidate strings
+        cutoff (float): Minimum similarity ratio in [0, 1]
+        
+    Returns:
+        str: Best candidate at or above the cutoff, or None
+    """
+    matcher = SequenceMatcher()
+    matcher.set_seq2(word)
+    best = None
+    best_ratio = cutoff
+    for candidate in possibilities:
+        matcher.set_seq1(candidate)
+        if (matcher.real_quick_ratio() >= best_ratio
+                and matcher.quick_ratio() >= best_ratio):
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = candidate, ratio
+    return best
 
 def normalize_location_name(location_name):
     """
@@ -143,8 +381,7 @@ def is_valid_city(city_name):
     if not city_name:
         return False
     
-    normalized = city_name.lower().strip()
-    return normalized in location_data._cities
+    return _norm(city_name) in get_location_data()._cities
 
 def is_valid_airport_code(code):
     """
@@ -159,11 +396,11 @@ def is_valid_airport_code(code):
     if not code:
         return False
     
-    # IATA codes are 3 uppercase letters
-    if not re.match(r'^[A-Z]{3}$', code.upper()):
-        return False
-    
-    return code.upper() in location_data._airports
+    # IATA codes are 3 ASCII letters; cheap str checks beat firing up the
+    # regex engine, and the table lookup settles membership anyway
+    code = code.upper()
+    return (len(code) == 3 and code.isascii() and code.isalpha()
+            and code in get_location_data()._airports)
 
 def get_suggested_locations(partial_name, limit=5):
     """
@@ -180,20 +417,21 @@ def get_suggested_locations(partial_name, limit=5):
         return []
     
     normalized = partial_name.lower().strip()
+    if len(normalized) < 2:
+        return []
     
-    # Search cities
-    city_matches = [city_data["name"] for _, city_data in location_data._cities.items() 
-                    if _.startswith(normalized)]
-    
-    # Search airports
-    airport_matches = [f"{airport_data['name']} ({code})" 
-                      for code, airport_data in location_data._airports.items() 
-                      if airport_data['name'].lower().startswith(normalized) or 
-                      code.lower().startswith(normalized)]
-    
-    # Combine and limit results
-    all_matches = city_matches + airport_matches
-    return all_matches[:limit]
+    # Only the bucket sharing the query's two leading characters can
+    # match. An airport indexed under both its name and code may appear
+    # twice in a bucket, so dedupe by display string while collecting.
+    matches = []
+    seen = set()
+    for key, display in get_location_data()._prefix.get(normalized[:2], ()):
+        if key.startswith(normalized) and display not in seen:
+            seen.add(display)
+            matches.append(display)
+            if len(matches) == limit:
+                break
+    return matches
 
 def get_airport_for_city(city_name):
     """
@@ -205,33 +443,67 @@ def get_airport_for_city(city_name):
     Returns:
         dict: Airport data or None if not found
     """
-    if not is_valid_city(city_name):
+    if not city_name:
+        return None
+    
+    key = _norm(city_name)
+    data = get_location_data()
+    if key not in data._cities:
         return None
     
-    airports = location_data.get_airports_by_city(city_name.lower().strip())
+    airports = data._airports_by_city.get(key)
     if not airports:
         return None
     
     # Simply return the first airport (in a real app, you might have logic to select the main one)
     return airports[0]
 
+_EARTH_RADIUS_KM = 6371.0
+
+# pyproj's compiled geodesic solver is both faster and ellipsoid-accurate;
+# fall back to the spherical haversine below when it is not installed
+try:
+    from pyproj import Geod
+    _GEOD = Geod(ellps='WGS84')
+except ImportError:
+    _GEOD = None
+
 def get_distance_between_locations(location1, location2):
     """
-    Calculate approximate distance between two locations.
+    Calculate the great-circle distance between two known cities.
     
-    Note: This is a placeholder function. In a real application, you would use
-    geolocation coordinates and the haversine formula or a mapping API.
+    Uses the haversine formula over the cities' coordinates. The default
+    sample dataset carries no coordinates, so this returns None there; a
+    data file can supply 'lat'/'lon' per city to enable it.
     
     Args:
         location1 (str): First location name
         location2 (str): Second location name
         
     Returns:
-        float: Approximate distance in kilometers or None if not calculable
+        float: Distance in kilometers or None if not calculable
     """
-    # This would be implemented with real geolocation data
-    # For now, return a placeholder message
-    return None
+    if not (location1 and location2):
+        return None
+    
+    cities = get_location_data()._cities
+    city1 = cities.get(_norm(location1))
+    city2 = cities.get(_norm(location2))
+    if not (city1 and city2):
+        return None
+    
+    lat1, lon1 = city1.lat, city1.lon
+    lat2, lon2 = city2.lat, city2.lon
+    if None in (lat1, lon1, lat2, lon2):
+        return None
+    
+    if _GEOD is not None:
+        return _GEOD.inv(lon1, lat1, lon2, lat2)[2] / 1000.0
+    
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * _EARTH_RADIUS_KM * math.asin(math.sqrt(h))
 
 def get_timezone_for_location(location_name):
     """
@@ -261,11 +533,12 @@ def is_domestic_travel(origin, destination):
     Returns:
         bool: True if domestic travel, False if international, None if undetermined
     """
-    if not (is_valid_city(origin) and is_valid_city(destination)):
+    if not (origin and destination):
         return None
     
-    origin_data = location_data.get_city(origin.lower().strip())
-    dest_data = location_data.get_city(destination.lower().strip())
+    cities = get_location_data()._cities
+    origin_data = cities.get(_norm(origin))
+    dest_data = cities.get(_norm(destination))
     
     if not (origin_data and dest_data):
         return None
@@ -281,10 +554,7 @@ def get_popular_destinations():
         list: List of popular destination names
     """
     # In a real app, this might be based on current trends or season
-    return [city_data['name'] for _, city_data in 
-            sorted(location_data._cities.items(), 
-                  key=lambda x: x[1]['population'], 
-                  reverse=True)[:5]]
+    return list(get_location_data()._popular)
 
 def validate_location_pair(origin, destination):
     """
@@ -300,12 +570,16 @@ def validate_location_pair(origin, destination):
     if not (origin and destination):
         return False
     
-    # Check if both are valid cities
-    if not (is_valid_city(origin) and is_valid_city(destination)):
+    # Normalize once; the canonical keys serve both the validity checks
+    # and the sameness comparison
+    origin_key = _norm(origin)
+    dest_key = _norm(destination)
+    cities = get_location_data()._cities
+    if origin_key not in cities or dest_key not in cities:
         return False
     
     # Check that origin and destination are not the same
-    return origin.lower().strip() != destination.lower().strip()
+    return origin_key != dest_key
 
 def find_iata_code(location_name):
     """
@@ -321,37 +595,55 @@ def find_iata_code(location_name):
     if not location_name:
         return None
         
+    data = get_location_data()
+    
     # Check for direct IATA code input
     if len(location_name) == 3 and location_name.isalpha():
         code = location_name.upper()
         if is_valid_airport_code(code):
-            airport = location_data.get_airport(code)
+            airport = data.get_airport(code)
             return {'name': airport['name'], 'iata': code}
     
-    # Try to find by city name
-    location_name_lower = location_name.lower().strip()
+    # Try to find by city name; normalize once and probe the tables with
+    # the canonical key instead of re-normalizing in every helper
+    key = _norm(location_name)
+    by_city = data._airports_by_city
     
     # Check if it's a city we know
-    if is_valid_city(location_name):
-        city_data = location_data.get_city(location_name_lower)
+    city_data = data._cities.get(key)
+    if city_data:
         # Find the main airport for this city
-        airports = location_data.get_airports_by_city(location_name_lower)
+        airports = by_city.get(key)
         if airports:
             return {'name': city_data['name'], 'iata': airports[0]['iata']}
     
-    # Try partial matching for cities
-    for city_key, city_data in location_data._cities.items():
-        if location_name_lower in city_key or city_key in location_name_lower:
-            # Find the main airport for this city
-            airports = location_data.get_airports_by_city(city_key)
-            if airports:
-                return {'name': city_data['name'], 'iata': airports[0]['iata']}
-    
-    # Try airports directly
-    airport_matches = location_data.search_airports(location_name)
-    if airport_matches:
-        first_key = next(iter(airport_matches))
-        airport = airport_matches[first_key]
+    # Try fuzzy/partial matching for cities. WRatio scores substrings and
+    # typos alike; the fallback keeps the old containment scan and adds
+    # difflib as a typo net.
+    match_key = None
+    if process is not None:
+        best = process.extractOne(key, data._cities.keys(),
+                                  scorer=fuzz.WRatio, score_cutoff=80)
+        if best:
+            match_key = best[0]
+    else:
+        for city_key in data._cities:
+            if key in city_key or city_key in key:
+                match_key = city_key
+                break
+        if match_key is None:
+            match_key = _best_close_match(key, data._cities)
+    if match_key:
+        airports = by_city.get(match_key)
+        if airports:
+            return {'name': data._cities[match_key]['name'],
+                    'iata': airports[0]['iata']}
+    
+    # Try airports directly; only the first match matters, so consume
+    # the generator instead of building the full results dict
+    first = next(data.iter_airport_matches(location_name), None)
+    if first:
+        airport = first[1]
         return {'name': airport['name'], 'iata': airport['iata']}
     
     # No matches found